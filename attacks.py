@@ -0,0 +1,175 @@
+"""
+Attack tables
+Precomputed bitboards of the squares a piece attacks from each
+square on the board, using the square numbering from board.py
+(a1 = 0 through h8 = 63). The tables are built once, when the
+module is first imported, so that checking a move only needs a
+table lookup and a bitwise AND.
+"""
+
+from board import FILES, RANKS
+
+
+# (file, rank) offsets of the eight squares a Knight can jump to.
+KNIGHT_OFFSETS = ((1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1), (-1, 2))
+
+
+def _leaper_table(offsets):
+    """
+    Builds a 64-entry table of the squares reachable from each square with a single jump
+    by one of the given (file, rank) offsets.
+    """
+
+    table = []
+    for index in range(64):
+        file_number = index % 8
+        rank_number = index // 8
+        attacks = 0
+        for file_offset, rank_offset in offsets:
+            target_file = file_number + file_offset
+            target_rank = rank_number + rank_offset
+            if 0 <= target_file < len(FILES) and 0 <= target_rank < len(RANKS):
+                attacks |= 1 << (target_rank * 8 + target_file)
+        table.append(attacks)
+    return tuple(table)
+
+
+KNIGHT_ATTACKS = _leaper_table(KNIGHT_OFFSETS)
+
+# (file, rank) offsets of the eight squares around a King.
+KING_OFFSETS = ((0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1), (-1, 0), (-1, 1))
+
+KING_ATTACKS = _leaper_table(KING_OFFSETS)
+
+# Pawns attack diagonally forward, so their table depends on their color.
+# PAWN_ATTACKS[WHITE] and PAWN_ATTACKS[BLACK] follow the color numbers in board.py.
+PAWN_ATTACKS = (_leaper_table(((-1, 1), (1, 1))), _leaper_table(((-1, -1), (1, -1))))
+
+
+# (file, rank) steps for each direction a sliding piece can travel in.
+NORTH = (0, 1)
+SOUTH = (0, -1)
+EAST = (1, 0)
+WEST = (-1, 0)
+NORTH_EAST = (1, 1)
+NORTH_WEST = (-1, 1)
+SOUTH_EAST = (1, -1)
+SOUTH_WEST = (-1, -1)
+
+ROOK_DIRECTIONS = (NORTH, SOUTH, EAST, WEST)
+BISHOP_DIRECTIONS = (NORTH_EAST, NORTH_WEST, SOUTH_EAST, SOUTH_WEST)
+DIRECTIONS = ROOK_DIRECTIONS + BISHOP_DIRECTIONS
+
+
+def _ray(index, direction):
+    """
+    Gets the squares from (but not including) the given square to the edge of the board
+    in one direction, in order of distance.
+    """
+
+    file_number = index % 8 + direction[0]
+    rank_number = index // 8 + direction[1]
+    squares = []
+    while 0 <= file_number < len(FILES) and 0 <= rank_number < len(RANKS):
+        squares.append(rank_number * 8 + file_number)
+        file_number += direction[0]
+        rank_number += direction[1]
+    return squares
+
+
+def _bitboard(squares):
+    bitboard = 0
+    for index in squares:
+        bitboard |= 1 << index
+    return bitboard
+
+
+# RAYS[direction][index] is the bitboard of every square from index to the edge of the board
+# in that direction, as if the board were empty.
+RAYS = {direction: tuple(_bitboard(_ray(index, direction)) for index in range(64)) for direction in DIRECTIONS}
+
+
+def _between_table():
+    table = [[0] * 64 for index in range(64)]
+    for index in range(64):
+        for direction in DIRECTIONS:
+            passed = 0
+            for target in _ray(index, direction):
+                table[index][target] = passed
+                passed |= 1 << target
+    return tuple(tuple(row) for row in table)
+
+
+# BETWEEN[a][b] is the bitboard of the squares strictly between squares a and b when they share a
+# rank, file, or diagonal, and 0 otherwise.
+BETWEEN = _between_table()
+
+
+def _line_table(directions):
+    """
+    Builds the occupancy-indexed attack lookup for one line through each square (a rank, file,
+    or diagonal, given as its two opposite directions).
+
+    Only the squares on the line between the piece and the edges of the board can block it,
+    so for each square the relevant occupancy is masked down to those squares, and every
+    possible masked occupancy is mapped to the squares attacked along the line. Looking up
+    attacks is then a mask and a dictionary lookup, whatever the position.
+    """
+
+    masks = []
+    tables = []
+    for index in range(64):
+        rays = [_ray(index, direction) for direction in directions]
+        # The last square of each ray is attacked whether or not it is occupied.
+        mask = _bitboard(square for ray in rays for square in ray[:-1])
+
+        table = {}
+        occupancy = 0
+        while True:
+            attacks = 0
+            for ray in rays:
+                for target in ray:
+                    attacks |= 1 << target
+                    if occupancy & (1 << target):
+                        break
+            table[occupancy] = attacks
+
+            # Step through every subset of the mask.
+            occupancy = (occupancy - mask) & mask
+            if occupancy == 0:
+                break
+        masks.append(mask)
+        tables.append(table)
+    return tuple(masks), tuple(tables)
+
+
+RANK_MASKS, RANK_ATTACKS = _line_table((EAST, WEST))
+FILE_MASKS, FILE_ATTACKS = _line_table((NORTH, SOUTH))
+DIAGONAL_MASKS, DIAGONAL_ATTACKS = _line_table((NORTH_EAST, SOUTH_WEST))
+ANTI_DIAGONAL_MASKS, ANTI_DIAGONAL_ATTACKS = _line_table((NORTH_WEST, SOUTH_EAST))
+
+# Attacks on an otherwise empty board.
+ROOK_RAYS = tuple(RANK_ATTACKS[index][0] | FILE_ATTACKS[index][0] for index in range(64))
+BISHOP_RAYS = tuple(DIAGONAL_ATTACKS[index][0] | ANTI_DIAGONAL_ATTACKS[index][0] for index in range(64))
+
+
+def rook_attacks(index, occupied):
+    """
+    Gets the bitboard of squares a Rook on the given square attacks, stopping at (and including)
+    the first occupied square in each direction.
+    """
+    return (RANK_ATTACKS[index][occupied & RANK_MASKS[index]] |
+            FILE_ATTACKS[index][occupied & FILE_MASKS[index]])
+
+
+def bishop_attacks(index, occupied):
+    """
+    Gets the bitboard of squares a Bishop on the given square attacks, stopping at (and including)
+    the first occupied square in each direction.
+    """
+    return (DIAGONAL_ATTACKS[index][occupied & DIAGONAL_MASKS[index]] |
+            ANTI_DIAGONAL_ATTACKS[index][occupied & ANTI_DIAGONAL_MASKS[index]])
+
+
+def queen_attacks(index, occupied):
+    return rook_attacks(index, occupied) | bishop_attacks(index, occupied)
@@ -0,0 +1,116 @@
+"""
+Batch move validation
+Checks many submitted moves from many independent games at
+once with NumPy, rather than calling a piece's move or capture
+method (and catching its exception) once per move.
+
+The positions are held as a struct of arrays over N boards:
+a (N, 64) array of piece codes and a (N, 64) array of moved
+flags, indexed by the square numbers from board.py. A piece
+code is the piece type number, plus 8 for a black piece, and
+0 marks an empty square. The moves are three arrays of the
+same length: which board each move is on, the square it
+moves from, and the square it moves to.
+
+The rules are the same ones the piece classes use, read from
+the tables in attacks.py. Requires NumPy.
+"""
+
+import numpy as np
+
+from board import WHITE, BLACK, PAWN, KNIGHT, ROOK
+from attacks import KNIGHT_ATTACKS, PAWN_ATTACKS, ROOK_RAYS, BETWEEN
+
+# Reason codes returned for each move.
+LEGAL = 0
+NO_PIECE = 1
+SAME_SPACE = 2
+OWN_PIECE = 3
+ILLEGAL_PATTERN = 4
+BLOCKED = 5
+UNSUPPORTED = 6
+
+
+def _table(bitboards):
+    """
+    Expands a 64-entry table of bitboards into a (64, 64) boolean array.
+    """
+    bitboards = np.array(bitboards, dtype=np.uint64)
+    return ((bitboards[..., np.newaxis] >> np.arange(64, dtype=np.uint64)) & np.uint64(1)).astype(bool)
+
+
+KNIGHT_TABLE = _table(KNIGHT_ATTACKS)
+PAWN_TABLE = np.stack([_table(PAWN_ATTACKS[WHITE]), _table(PAWN_ATTACKS[BLACK])])
+ROOK_TABLE = _table(ROOK_RAYS)
+BETWEEN_TABLE = _table(BETWEEN)
+
+
+def encode_boards(boards):
+    """
+    Gets the piece code and moved flag arrays for a list of Boards.
+    """
+
+    pieces = np.zeros((len(boards), 64), dtype=np.int8)
+    moved = np.zeros((len(boards), 64), dtype=bool)
+    for board_id, board in enumerate(boards):
+        for piece in board.pieces(WHITE) + board.pieces(BLACK):
+            index = piece.current_space.index
+            pieces[board_id, index] = piece.code
+            moved[board_id, index] = piece.moved
+    return pieces, moved
+
+
+def validate(pieces, moved, board_ids, origins, targets):
+    """
+    Checks each move (board_ids[i], origins[i], targets[i]) against its board, and returns an array
+    of reason codes, LEGAL for each legal move.
+    """
+
+    board_ids = np.asarray(board_ids, dtype=np.intp)
+    origins = np.asarray(origins, dtype=np.intp)
+    targets = np.asarray(targets, dtype=np.intp)
+
+    piece = pieces[board_ids, origins].astype(np.int16)
+    victim = pieces[board_ids, targets].astype(np.int16)
+    kind = piece & 7
+    side = piece >> 3
+
+    target_empty = victim == 0
+    target_enemy = ~target_empty & ((victim >> 3) != side)
+    path_blocked = (BETWEEN_TABLE[origins, targets] & (pieces[board_ids] != 0)).any(axis=1)
+
+    # Knights jump straight to any square their table allows.
+    knight_ok = KNIGHT_TABLE[origins, targets]
+
+    # Rooks slide along their rank or file, and nothing may stand between them and their target.
+    rook_ok = ROOK_TABLE[origins, targets]
+
+    # Pawns push forward onto empty squares, one square or two on their first move, and capture
+    # diagonally forward.
+    step = np.where(side == WHITE, 8, -8)
+    push_one = targets - origins == step
+    push_two = (targets - origins == 2 * step) & ~moved[board_ids, origins]
+    pawn_capture = PAWN_TABLE[side, origins, targets]
+    pawn_ok = np.where(target_empty, push_one | push_two, pawn_capture)
+
+    reasons = np.full(len(origins), LEGAL, dtype=np.int8)
+
+    pattern_ok = np.select([kind == KNIGHT, kind == ROOK, kind == PAWN], [knight_ok, rook_ok, pawn_ok], False)
+    # A Pawn can only push onto an empty square, and the square it passes on a double push must be empty too.
+    pawn_blocked = (kind == PAWN) & (push_one | push_two) & (~target_empty | path_blocked)
+    rook_blocked = (kind == ROOK) & rook_ok & path_blocked
+
+    reasons[~pattern_ok] = ILLEGAL_PATTERN
+    reasons[pawn_blocked | rook_blocked] = BLOCKED
+    reasons[pattern_ok & ~target_empty & ~target_enemy] = OWN_PIECE
+    reasons[(kind != PAWN) & (kind != KNIGHT) & (kind != ROOK)] = UNSUPPORTED
+    reasons[origins == targets] = SAME_SPACE
+    reasons[piece == 0] = NO_PIECE
+    return reasons
+
+
+def is_legal(pieces, moved, board_ids, origins, targets):
+    """
+    Gets a boolean array of which moves are legal.
+    """
+    return validate(pieces, moved, board_ids, origins, targets) == LEGAL
@@ -6,9 +6,35 @@ has its column identified with a letter from
 a-h and its row identified with a number from
 1-8. The Board object is composed of one
 Space object for each square.
+
+Occupancy is kept as 64-bit integers (bitboards), one
+per color and one per piece type, where bit n is set when
+square n is occupied. Squares are numbered from a1 = 0 to
+h8 = 63, moving along each rank before moving up a rank.
+Spaces are views over this state: reading or assigning
+Space.current_piece reads or updates the Board.
+
+The Board also keeps a 64-bit Zobrist hash of where each piece
+stands, updated along with the bitboards whenever a piece is put
+on or taken off a square, so that two positions can be compared
+by comparing their hashes.
+
+It also keeps, for each color, an attack map: the bitboard of
+every square that color's pieces attack. Each square's attacks
+are stored along with a count, for each color, of how many pieces
+attack each square. When a piece is put on or taken off a square,
+only that square's attacks and those of the sliding pieces whose
+lines pass through it are worked out again, so asking whether a
+square is attacked is a single lookup.
+
+Finally, it keeps running middlegame and endgame scores and the
+game phase for evaluation (see evaluate.py), updated the same way.
 """
 
 from enum import Enum
+import random
+
+from evaluate import MIDDLEGAME_SCORES, ENDGAME_SCORES, PHASE_WEIGHTS
 
 
 MIN_RANK = 1
@@ -19,49 +45,180 @@ RANKS = (1, 2, 3, 4, 5, 6, 7, 8)
 FILES = ("a", "b", "c", "d", "e", "f", "g", "h")
 FIRST_RANK_LIGHT = ("b", "d", "f", "h")
 
+# Piece type numbers. Each piece class declares its type, and the
+# Board keeps one bitboard per type. Bishops, queens, and kings are
+# reserved here so that their bitboards exist once they are implemented.
+PAWN = 1
+KNIGHT = 2
+BISHOP = 3
+ROOK = 4
+QUEEN = 5
+KING = 6
+
+# Color numbers used to index the per-color bitboards.
+WHITE = 0
+BLACK = 1
+
+# Piece letters in Forsyth-Edwards Notation (FEN), by piece type number. White pieces
+# use the upper-case letter and black pieces the lower-case one.
+FEN_LETTERS = " PNBRQK"
+
+# Castling rights in FEN, with the square of the Rook that still has them.
+FEN_CASTLING = {"K": 7, "Q": 0, "k": 63, "q": 56}
+
+# The King's starting square for each color, which it must not have left to castle.
+KING_HOMES = (4, 60)
+
+# The en passant flag of an encoded move, in place (see move.py, which imports this module).
+EN_PASSANT_MOVE = 4 << 12
+
+
+# Square numbers by (file, rank) and by name, e.g. SQUARE_INDEX[("e", 4)] and SQUARE_NAMES["e4"] are both 28.
+SQUARE_INDEX = {(file, rank): (rank - 1) * 8 + file_number
+                for rank in RANKS for file_number, file in enumerate(FILES)}
+SQUARE_NAMES = {file + str(rank): index for (file, rank), index in SQUARE_INDEX.items()}
+
+
+def square_index(file, rank):
+    """
+    Converts a file letter and rank number into a square number from 0 (a1) to 63 (h8).
+    """
+    return SQUARE_INDEX[(file, rank)]
+
+
+def _zobrist_keys():
+    # A fixed seed keeps hashes the same from one run to the next, so they can be stored.
+    generator = random.Random(0x5EED)
+    return tuple(tuple(tuple(generator.getrandbits(64) for index in range(64))
+                       for kind in range(KING + 1))
+                 for side in (WHITE, BLACK))
+
+
+# ZOBRIST_KEYS[side][kind][index] is the random key for a piece of that color and type on that square.
+# A Board's hash is the XOR of the keys of every piece on it. It covers where the pieces stand,
+# not whether they have moved.
+ZOBRIST_KEYS = _zobrist_keys()
+
+# XOR this into a Board's hash to tell apart the same position with Black rather than White to move.
+BLACK_TO_MOVE_KEY = random.Random(0x5EED + 1).getrandbits(64)
+
+
+def side_of(color):
+    """
+    Gets the color number (WHITE or BLACK) for a piece color, which may be given
+    either as a color number or as a PieceColor.
+    """
+    if color in (WHITE, BLACK):
+        return color
+    return WHITE if color.value > 0 else BLACK
+
+
+def iter_squares(bitboard):
+    """
+    Yields the number of each square set in a bitboard, from a1 toward h8.
+    """
+    while bitboard:
+        lowest = bitboard & -bitboard
+        yield lowest.bit_length() - 1
+        bitboard ^= lowest
+
 
 class Color(Enum):
     LIGHT = 1
     DARK = 2
 
+
+def _square_color(file, rank):
+
+    if rank % 2 == 0:
+
+        # Even ranks for which the first rank in the file is light are themselves dark.
+        # e.g. h1 is light; h2, h4, h6, and h8 are dark.
+        if file in FIRST_RANK_LIGHT:
+            return Color.DARK
+
+        # Even ranks for which the first rank in the file is dark are themselves light.
+        # e.g. a1 is dark; a2, a4, a6, and a8 are light.
+        else:
+            return Color.LIGHT
+
+    else:
+
+        # Odd ranks for which the first rank in the file is light are themselves light.
+        # e.g. h1 is light; h3, h5, and h7 are also light.
+        if file in FIRST_RANK_LIGHT:
+            return Color.LIGHT
+
+        # Odd ranks for which the first rank in the file is dark are themselves dark.
+        # e.g. a1 is dark; a3, a5, and a7 are also dark.
+        else:
+            return Color.DARK
+
+
+# SQUARES[index] holds the parts of a square that never change: its file, rank, name, and color.
+# Spaces read these from here rather than each working them out and storing its own copy.
+SQUARES = tuple((file, rank, file + str(rank), _square_color(file, rank))
+                for rank in RANKS for file in FILES)
+
+
 class Space:
 
-    def __init__(self, file, rank):
+    __slots__ = ("index", "board", "_piece")
+
+    def __init__(self, file, rank, board=None):
 
         if(rank in RANKS) and (file in FILES):
-            # Keeping rank and file separate allows identification without
-            # parsing the input.
-            self.rank = rank
-            self.file = file
-            self.name = file + str(rank)
+            self.index = square_index(file, rank)
         else:
             raise ValueError()
 
-        if self.rank % 2 == 0:
+        # A Space that belongs to a Board stores its piece on the Board.
+        self.board = board
+        self._piece = None
 
-            # Even ranks for which the first rank in the file is light are themselves dark.
-            # e.g. h1 is light; h2, h4, h6, and h8 are dark.
-            if self.file in FIRST_RANK_LIGHT:
-                self.color = Color.DARK
+    # Keeping rank and file separate allows identification without
+    # parsing the input.
+    @property
+    def file(self):
+        return SQUARES[self.index][0]
 
-            # Even ranks for which the first rank in the file is dark are themselves light.
-            # e.g. a1 is dark; a2, a4, a6, and a8 are light.
-            else:
-                self.color = Color.LIGHT
+    @property
+    def rank(self):
+        return SQUARES[self.index][1]
 
-        else:
+    @property
+    def name(self):
+        return SQUARES[self.index][2]
 
-            # Odd ranks for which the first rank in the file is light are themselves light.
-            # e.g. h1 is light; h3, h5, and h7 are also light.
-            if self.file in FIRST_RANK_LIGHT:
-                self.color = Color.LIGHT
+    @property
+    def color(self):
+        return SQUARES[self.index][3]
 
-            # Odd ranks for which the first rank in the file is dark are themselves dark.
-            # e.g. a1 is dark; a3, a5, and a7 are also dark.
-            else:
-                self.color = Color.DARK
+    # The file and rank as numbers from 0 to 7, e.g. 0 for the a-file and 0 for the first rank.
+    @property
+    def file_index(self):
+        return self.index & 7
 
-        self.current_piece = None
+    @property
+    def rank_index(self):
+        return self.index >> 3
+
+    @property
+    def bit(self):
+        return 1 << self.index
+
+    @property
+    def current_piece(self):
+        if self.board is None:
+            return self._piece
+        return self.board.squares[self.index]
+
+    @current_piece.setter
+    def current_piece(self, piece):
+        if self.board is None:
+            self._piece = piece
+        else:
+            self.board.set_piece(self.index, piece)
 
 
 class Board:
@@ -69,36 +226,460 @@ class Board:
     The Board is represented as a list of lists. Each sub-list represents a file, and each file has a Space
     for each rank on the board. This makes the Board an 8x8 grid, each file name in algebraic notation corresponding
     to a row in the grid.
+
+    The pieces themselves are kept in a flat list of 64 squares alongside the
+    bitboards, so that the Spaces only need to know their own square number.
+    Since a Space holds no state of its own, each one is only created the first
+    time it is asked for, and a new Board allocates nothing but its occupancy.
+
+    A copy of a Board (see copy) starts out with only the bitboards and a code
+    for each square, and creates its own pieces the first time they are needed.
     """
 
     def __init__(self):
-        self.spaces = []
+        self.squares = [None] * 64
+        self.occupied = 0
+        self.color_occupancy = [0, 0]
+        self.type_occupancy = [0] * (KING + 1)
+        self.hash_key = 0
+
+        # The bitboard of squares attacked by the piece on each square (0 for an empty square),
+        # how many pieces of each color attack each square, and from those the squares each
+        # color attacks.
+        self.square_attacks = [0] * 64
+        self.attack_counts = ([0] * 64, [0] * 64)
+        self.attack_maps = [0, 0]
+
+        # The material and piece-square scores of every piece, from White's point of view, and the game phase.
+        self.middlegame_score = 0
+        self.endgame_score = 0
+        self.phase = 0
+
+        # One entry per move played with make_move: the move, the piece it captured,
+        # whether the moving piece had moved before, and the hash before the move.
+        self.undo_stack = []
+
+        self._spaces = [None] * 64
+
+    def __getattr__(self, name):
+        # Only called for an attribute that is not set, which is the pieces of a copy that has not needed them yet.
+        if name != "squares" or "_codes" not in self.__dict__:
+            raise AttributeError(name)
+
+        # The piece classes import this module, so they can only be imported once it is loaded.
+        from piece import piece_from_code
+        import pawn, knight, rook, king
+
+        codes = self._codes
+        moved = self._moved
+        squares = [None] * 64
+        for index in iter_squares(self.occupied):
+            piece = piece_from_code(codes[index])
+            piece.moved = bool(moved >> index & 1)
+            piece.current_space = self.space_at(index)
+            squares[index] = piece
+
+        self.squares = squares
+        del self._codes, self._moved
+        return squares
+
+    def copy(self):
+        """
+        Gets a new Board with the same position, whose pieces can be moved without affecting this one.
+
+        The bitboards, attack maps, and scores are copied as they are. The pieces are not: the copy
+        gets the piece code (see Piece.code) of each square and a bitboard of the pieces that have
+        moved, and only creates its own pieces from them the first time it needs them, so a copy
+        that is only looked at through its bitboards never creates any. A copy of such a copy
+        shares its codes. The copy starts with no moves to take back.
+        """
+
+        board = Board.__new__(Board)
+        board.occupied = self.occupied
+        board.color_occupancy = self.color_occupancy[:]
+        board.type_occupancy = self.type_occupancy[:]
+        board.hash_key = self.hash_key
+        board.square_attacks = self.square_attacks[:]
+        board.attack_counts = (self.attack_counts[0][:], self.attack_counts[1][:])
+        board.attack_maps = self.attack_maps[:]
+        board.middlegame_score = self.middlegame_score
+        board.endgame_score = self.endgame_score
+        board.phase = self.phase
+        board.undo_stack = []
+        board._spaces = [None] * 64
+
+        if "squares" in self.__dict__:
+            codes = bytearray(64)
+            moved = 0
+            squares = self.squares
+            for index in iter_squares(self.occupied):
+                piece = squares[index]
+                codes[index] = piece.code
+                if piece.moved:
+                    moved |= 1 << index
+            board._codes = bytes(codes)
+            board._moved = moved
+        else:
+            board._codes = self._codes
+            board._moved = self._moved
+        return board
+
+    @property
+    def spaces(self):
+        return [[self.space_at(rank * 8 + file) for rank in range(len(RANKS))] for file in range(len(FILES))]
+
+    def space_at(self, index):
+        """
+        Gets the Space with the given square number, from 0 (a1) to 63 (h8).
+        """
+
+        space = self._spaces[index]
+        if space is None:
+            space = Space.__new__(Space)
+            space.index = index
+            space.board = self
+            space._piece = None
+            self._spaces[index] = space
+        return space
+
+    def set_piece(self, index, piece):
+        """
+        Puts a piece (or None, to empty it) on the square with the given number and
+        updates the bitboards, the hash, the attack maps, and the evaluation scores. This does not
+        update the piece's own current_space; the Piece methods are responsible for that.
+        """
+
+        bit = 1 << index
+        previous = self.squares[index]
+
+        if previous is not None:
+            side = previous.side
+            kind = previous.kind
+            self.color_occupancy[side] &= ~bit
+            self.type_occupancy[kind] &= ~bit
+            self.hash_key ^= ZOBRIST_KEYS[side][kind][index]
+            self.middlegame_score -= MIDDLEGAME_SCORES[side][kind][index]
+            self.endgame_score -= ENDGAME_SCORES[side][kind][index]
+            self.phase -= PHASE_WEIGHTS[kind]
+
+        if piece is not None:
+            side = piece.side
+            kind = piece.kind
+            self.color_occupancy[side] |= bit
+            self.type_occupancy[kind] |= bit
+            self.hash_key ^= ZOBRIST_KEYS[side][kind][index]
+            self.middlegame_score += MIDDLEGAME_SCORES[side][kind][index]
+            self.endgame_score += ENDGAME_SCORES[side][kind][index]
+            self.phase += PHASE_WEIGHTS[kind]
+
+        self.squares[index] = piece
+        occupied = self.occupied = self.color_occupancy[WHITE] | self.color_occupancy[BLACK]
+
+        square_attacks = self.square_attacks
+        if previous is not None:
+            self._change_attacks(previous.side, square_attacks[index], 0)
+            square_attacks[index] = 0
+        if piece is not None:
+            attacks = square_attacks[index] = piece.attacks_from(index, occupied)
+            self._change_attacks(piece.side, 0, attacks)
+
+        # A sliding piece that reaches this square is now blocked there, or can now see past it.
+        sliders = (self.type_occupancy[BISHOP] | self.type_occupancy[ROOK] | self.type_occupancy[QUEEN]) & ~bit
+        squares = self.squares
+        for slider in iter_squares(sliders):
+            old = square_attacks[slider]
+            if old & bit:
+                slider_piece = squares[slider]
+                new = square_attacks[slider] = slider_piece.attacks_from(slider, occupied)
+                self._change_attacks(slider_piece.side, old, new)
+
+    def _change_attacks(self, side, old, new):
+        """
+        Updates one color's attack counts and attack map for a piece that attacked the squares in
+        old and now attacks the squares in new.
+        """
+
+        counts = self.attack_counts[side]
+        attack_map = self.attack_maps[side]
+
+        lost = old & ~new
+        while lost:
+            lowest = lost & -lost
+            index = lowest.bit_length() - 1
+            counts[index] -= 1
+            if not counts[index]:
+                attack_map ^= lowest
+            lost ^= lowest
+
+        gained = new & ~old
+        attack_map |= gained
+        while gained:
+            lowest = gained & -gained
+            counts[lowest.bit_length() - 1] += 1
+            gained ^= lowest
+
+        self.attack_maps[side] = attack_map
+
+    def refresh_attacks(self):
+        """
+        Works out every square's attacks and both attack maps from scratch, for a Board whose
+        pieces were put on it without set_piece.
+        """
+
+        self.square_attacks = [0] * 64
+        self.attack_counts = ([0] * 64, [0] * 64)
+        self.attack_maps = [0, 0]
+        for index in iter_squares(self.occupied):
+            piece = self.squares[index]
+            attacks = self.square_attacks[index] = piece.attacks_from(index, self.occupied)
+            self._change_attacks(piece.side, 0, attacks)
+
+    def is_attacked(self, index, color):
+        """
+        Checks whether any piece of the given color attacks the square with the given number.
+        """
+        return bool(self.attack_maps[side_of(color)] >> index & 1)
+
+    @classmethod
+    def from_fen(cls, fen):
+        """
+        Sets up a Board from a position in Forsyth-Edwards Notation (FEN). Only the piece placement
+        and castling fields are read; the other fields describe the game rather than the Board.
+
+        The pieces are put straight onto the squares and the bitboards, hash, and scores are filled
+        in as the placement is read, rather than placing and checking each piece in turn. Since FEN does
+        not record whether a piece has moved, Pawns off their starting rank, Rooks without
+        castling rights, and Kings whose player cannot castle at all are treated as having moved.
+
+        Raises ValueError if the FEN is malformed or uses a piece that is not implemented.
+        """
+
+        # The piece classes import this module, so they can only be imported once it is loaded.
+        from piece import PIECE_CLASSES, piece_from_code
+        import pawn, knight, rook, king
+
+        fields = fen.split()
+        if not fields:
+            raise ValueError("Empty FEN.")
+        rows = fields[0].split("/")
+        if len(rows) != len(RANKS):
+            raise ValueError("A FEN placement must have one row for each rank.")
+        castling = fields[2] if len(fields) > 2 else "-"
+        unmoved_rooks = {FEN_CASTLING[letter] for letter in castling if letter in FEN_CASTLING}
+        unmoved_kings = {KING_HOMES[WHITE if letter.isupper() else BLACK]
+                         for letter in castling if letter in FEN_CASTLING}
+
+        board = cls()
+        squares = board.squares
+        color_occupancy = board.color_occupancy
+        type_occupancy = board.type_occupancy
+        hash_key = 0
+        middlegame_score = 0
+        endgame_score = 0
+        phase = 0
+
+        for row_number, row in enumerate(rows):
+            rank_number = len(RANKS) - 1 - row_number
+            file_number = 0
+            for letter in row:
+                if letter.isdigit():
+                    file_number += int(letter)
+                    continue
+
+                kind = FEN_LETTERS.find(letter.upper())
+                if kind < 1 or file_number >= len(FILES):
+                    raise ValueError("Bad FEN placement: " + row)
+                if kind not in PIECE_CLASSES:
+                    raise ValueError("The piece " + letter + " is not supported.")
+
+                side = WHITE if letter.isupper() else BLACK
+                index = rank_number * 8 + file_number
+                piece = piece_from_code(kind | (side << 3))
+                piece.current_space = board.space_at(index)
+                if kind == PAWN:
+                    piece.moved = rank_number != (1 if side == WHITE else 6)
+                elif kind == ROOK:
+                    piece.moved = index not in unmoved_rooks
+                elif kind == KING:
+                    piece.moved = index not in unmoved_kings
+
+                squares[index] = piece
+                color_occupancy[side] |= 1 << index
+                type_occupancy[kind] |= 1 << index
+                hash_key ^= ZOBRIST_KEYS[side][kind][index]
+                middlegame_score += MIDDLEGAME_SCORES[side][kind][index]
+                endgame_score += ENDGAME_SCORES[side][kind][index]
+                phase += PHASE_WEIGHTS[kind]
+                file_number += 1
+
+            if file_number != len(FILES):
+                raise ValueError("Bad FEN placement: " + row)
+
+        board.occupied = color_occupancy[WHITE] | color_occupancy[BLACK]
+        board.hash_key = hash_key
+        board.middlegame_score = middlegame_score
+        board.endgame_score = endgame_score
+        board.phase = phase
+        board.refresh_attacks()
+        return board
 
-        for file in FILES:
-            new_file = []
-            for rank in RANKS:
-                new_file.append(Space(file, rank))
-            self.spaces.append(new_file)
+    def to_fen(self, color=WHITE, en_passant=None, halfmove=0, fullmove=1):
+        """
+        Gets the position in Forsyth-Edwards Notation (FEN), with the given player to move, the
+        given en passant square number, if any, and the given move counters (see Game.to_fen,
+        which knows them). Castling rights are given for Rooks that have not moved, on their
+        starting corners, with a King of the same color that has not moved on its starting square.
+        """
+
+        rows = []
+        for rank_number in reversed(range(len(RANKS))):
+            row = ""
+            empty = 0
+            for index in range(rank_number * 8, rank_number * 8 + 8):
+                piece = self.squares[index]
+                if piece is None:
+                    empty += 1
+                    continue
+                if empty:
+                    row += str(empty)
+                    empty = 0
+                letter = FEN_LETTERS[piece.kind]
+                row += letter if piece.side == WHITE else letter.lower()
+            if empty:
+                row += str(empty)
+            rows.append(row)
+
+        castling = ""
+        for letter, index in FEN_CASTLING.items():
+            side = WHITE if letter.isupper() else BLACK
+            piece = self.squares[index]
+            king = self.squares[KING_HOMES[side]]
+            if piece is not None and piece.kind == ROOK and not piece.moved and piece.side == side and \
+                    king is not None and king.kind == KING and not king.moved and king.side == side:
+                castling += letter
+
+        side = "w" if side_of(color) == WHITE else "b"
+        passed = SQUARES[en_passant][2] if en_passant is not None else "-"
+        return " ".join(("/".join(rows), side, castling or "-", passed, str(halfmove), str(fullmove)))
+
+    def occupancy(self, side=None, kind=None):
+        """
+        Gets the bitboard of occupied squares, optionally restricted to one color (WHITE or
+        BLACK) and/or one piece type (PAWN, KNIGHT, ROOK, ...).
+        """
+
+        bitboard = self.occupied
+        if side is not None:
+            bitboard &= self.color_occupancy[side]
+        if kind is not None:
+            bitboard &= self.type_occupancy[kind]
+        return bitboard
 
 
 
+    def pieces(self, color, kind=None):
+        """
+        Gets the pieces of one color, optionally only those of one type (PAWN, KNIGHT, ROOK, ...),
+        in square order. The occupancy bitboards already index which squares each color's pieces
+        stand on, so this only visits those squares rather than all 64.
+        """
+
+        squares = self.squares
+        return [squares[index] for index in iter_squares(self.occupancy(side_of(color), kind))]
+
+    def count(self, color, kind=None):
+        """
+        Gets the number of pieces of one color, optionally only those of one type.
+        """
+        return self.occupancy(side_of(color), kind).bit_count()
+
     def get_space(self, file, rank):
         """
         Gets a Space by converting the arguments into the coordinates of the Space in the board's grid.
         Although files represent columns on the board and Cartesian coordinates are specified in (x, y)
         format, having the first argument be file here lets the argument take the form of algebraic notation
-        which lists the file first (e.g. a1 instead of 1a.)
+        which lists the file first (e.g. a1 instead of 1a.) Returns None if there is no such Space.
+        """
+
+        index = SQUARE_INDEX.get((file, rank))
+        if index is None:
+            return None
+        return self.space_at(index)
+
+    def generate_moves(self, color):
+        """
+        Gets every move the given player can make in one pass, as a list of moves
+        encoded as integers (see move.py). Each piece works out its own moves from
+        the Board's bitboards, so no move is tried and rejected along the way.
+        """
+
+        side = side_of(color)
+        squares = self.squares
+        moves = []
+        for index in iter_squares(self.color_occupancy[side]):
+            squares[index].generate_moves(self, moves)
+        return moves
+
+    def legal_moves(self, color):
+        """
+        Gets every move the given player can make without leaving their own King in check (see legal.py).
+        """
+
+        # legal.py imports this module, so it can only be imported once it is loaded.
+        from legal import legal_moves
+        return legal_moves(self, color)
+
+    def in_check(self, color):
+        """
+        Checks whether the given player's King is attacked.
+        """
+
+        side = side_of(color)
+        return bool(self.type_occupancy[KING] & self.color_occupancy[side] & self.attack_maps[1 - side])
+
+    def make_move(self, move):
+        """
+        Plays a move encoded as in move.py, such as one from generate_moves, without checking
+        that it is legal. The move can be taken back with unmake_move. A move flagged as en passant
+        captures the Pawn it passes rather than a piece on its target.
         """
 
-        # Map file names to list element numbers
+        origin = move & 63
+        target = (move >> 6) & 63
+        piece = self.squares[origin]
 
-        files = {'a': 0, 'b': 1, 'c': 2, 'd': 3, 'e': 4, 'f': 5, 'g': 6, 'h': 7}
+        # A Pawn capturing en passant takes the Pawn beside it, on its own rank and the target's file.
+        captured_index = (origin & 56) | (target & 7) if move & EN_PASSANT_MOVE else target
+        captured = self.squares[captured_index]
 
-        rank_position = rank - 1
+        self.undo_stack.append((move, captured, piece.moved, self.hash_key))
+
+        if captured is not None:
+            captured.current_space = None
+            if captured_index != target:
+                self.set_piece(captured_index, None)
+        self.set_piece(origin, None)
+        self.set_piece(target, piece)
+        piece.current_space = self.space_at(target)
+        piece.moved = True
+
+    def unmake_move(self):
+        """
+        Takes back the last move played with make_move, putting back any piece it captured.
+        """
 
-        try:
-            target_space = self.spaces[files[file]][rank_position]
-        except IndexError:
-            target_space = None
+        move, captured, moved, hash_key = self.undo_stack.pop()
+        origin = move & 63
+        target = (move >> 6) & 63
+        piece = self.squares[target]
 
-        return target_space
\ No newline at end of file
+        if move & EN_PASSANT_MOVE:
+            self.set_piece(target, None)
+            target = (origin & 56) | (target & 7)
+        self.set_piece(target, captured)
+        self.set_piece(origin, piece)
+        piece.current_space = self.space_at(origin)
+        piece.moved = moved
+        if captured is not None:
+            captured.current_space = self.space_at(target)
+        self.hash_key = hash_key
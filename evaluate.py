@@ -0,0 +1,132 @@
+"""
+Evaluation
+Scores a position by material and by where each piece stands,
+from piece-square tables for pawns, knights, and rooks. Each
+piece has two scores, one for the middlegame and one for the
+endgame, and the two are blended by how much material is left
+on the Board (the game phase).
+
+The Board keeps both totals and the phase up to date as pieces
+are put on and taken off squares, adding and subtracting each
+piece's scores from the tables below, so evaluating a position
+never looks at its squares.
+
+The tables here are indexed by the piece type numbers and
+color numbers from board.py, which imports this module, so
+this module does not import it.
+"""
+
+# Material values by piece type number (pawn, knight, bishop, rook, queen, king), in hundredths of a Pawn.
+MIDDLEGAME_VALUES = (0, 100, 320, 330, 500, 900, 0)
+ENDGAME_VALUES = (0, 120, 300, 330, 540, 900, 0)
+
+# How much each piece type counts toward the game phase. A full set of pieces adds up to TOTAL_PHASE,
+# and the endgame scores take over as the phase falls toward 0.
+PHASE_WEIGHTS = (0, 0, 1, 1, 2, 4, 0)
+TOTAL_PHASE = 24
+
+# Piece-square tables, written from White's side of the board with the eighth rank at the top,
+# so that each table reads like a diagram.
+PAWN_MIDDLEGAME = (
+     0,   0,   0,   0,   0,   0,   0,   0,
+    50,  50,  50,  50,  50,  50,  50,  50,
+    10,  10,  20,  30,  30,  20,  10,  10,
+     5,   5,  10,  25,  25,  10,   5,   5,
+     0,   0,   0,  20,  20,   0,   0,   0,
+     5,  -5, -10,   0,   0, -10,  -5,   5,
+     5,  10,  10, -20, -20,  10,  10,   5,
+     0,   0,   0,   0,   0,   0,   0,   0,
+)
+
+PAWN_ENDGAME = (
+     0,   0,   0,   0,   0,   0,   0,   0,
+    80,  80,  80,  80,  80,  80,  80,  80,
+    50,  50,  50,  50,  50,  50,  50,  50,
+    30,  30,  30,  30,  30,  30,  30,  30,
+    20,  20,  20,  20,  20,  20,  20,  20,
+    10,  10,  10,  10,  10,  10,  10,  10,
+    10,  10,  10,  10,  10,  10,  10,  10,
+     0,   0,   0,   0,   0,   0,   0,   0,
+)
+
+KNIGHT_MIDDLEGAME = (
+   -50, -40, -30, -30, -30, -30, -40, -50,
+   -40, -20,   0,   0,   0,   0, -20, -40,
+   -30,   0,  10,  15,  15,  10,   0, -30,
+   -30,   5,  15,  20,  20,  15,   5, -30,
+   -30,   0,  15,  20,  20,  15,   0, -30,
+   -30,   5,  10,  15,  15,  10,   5, -30,
+   -40, -20,   0,   5,   5,   0, -20, -40,
+   -50, -40, -30, -30, -30, -30, -40, -50,
+)
+
+KNIGHT_ENDGAME = (
+   -50, -40, -30, -30, -30, -30, -40, -50,
+   -40, -20, -10, -10, -10, -10, -20, -40,
+   -30, -10,  10,  15,  15,  10, -10, -30,
+   -30, -10,  15,  20,  20,  15, -10, -30,
+   -30, -10,  15,  20,  20,  15, -10, -30,
+   -30, -10,  10,  15,  15,  10, -10, -30,
+   -40, -20, -10, -10, -10, -10, -20, -40,
+   -50, -40, -30, -30, -30, -30, -40, -50,
+)
+
+ROOK_MIDDLEGAME = (
+     0,   0,   0,   0,   0,   0,   0,   0,
+     5,  10,  10,  10,  10,  10,  10,   5,
+    -5,   0,   0,   0,   0,   0,   0,  -5,
+    -5,   0,   0,   0,   0,   0,   0,  -5,
+    -5,   0,   0,   0,   0,   0,   0,  -5,
+    -5,   0,   0,   0,   0,   0,   0,  -5,
+    -5,   0,   0,   0,   0,   0,   0,  -5,
+     0,   0,   0,   5,   5,   0,   0,   0,
+)
+
+ROOK_ENDGAME = (
+     0,   0,   0,   0,   0,   0,   0,   0,
+    10,  10,  10,  10,  10,  10,  10,  10,
+     0,   0,   0,   0,   0,   0,   0,   0,
+     0,   0,   0,   0,   0,   0,   0,   0,
+     0,   0,   0,   0,   0,   0,   0,   0,
+     0,   0,   0,   0,   0,   0,   0,   0,
+     0,   0,   0,   0,   0,   0,   0,   0,
+     0,   0,   0,   0,   0,   0,   0,   0,
+)
+
+NO_TABLE = (0,) * 64
+
+# Tables by piece type number. Bishops, queens, and kings only score their material for now.
+MIDDLEGAME_TABLES = (NO_TABLE, PAWN_MIDDLEGAME, KNIGHT_MIDDLEGAME, NO_TABLE, ROOK_MIDDLEGAME, NO_TABLE, NO_TABLE)
+ENDGAME_TABLES = (NO_TABLE, PAWN_ENDGAME, KNIGHT_ENDGAME, NO_TABLE, ROOK_ENDGAME, NO_TABLE, NO_TABLE)
+
+
+def _square_scores(values, tables):
+    """
+    Builds scores[side][kind][index]: the material and table score of a piece on a square,
+    positive for White (side 0) and negative for Black (side 1), so that a Board's total
+    is always from White's point of view.
+    """
+
+    white = []
+    black = []
+    for value, table in zip(values, tables):
+        # Square a1 is in the bottom row of the diagram; Black's tables are White's turned upside down.
+        white.append(tuple(value + table[(7 - index // 8) * 8 + index % 8] for index in range(64)))
+        black.append(tuple(-(value + table[(index // 8) * 8 + index % 8]) for index in range(64)))
+    return tuple(white), tuple(black)
+
+
+MIDDLEGAME_SCORES = _square_scores(MIDDLEGAME_VALUES, MIDDLEGAME_TABLES)
+ENDGAME_SCORES = _square_scores(ENDGAME_VALUES, ENDGAME_TABLES)
+
+
+def evaluate(board, side):
+    """
+    Scores a position from the point of view of the given player (0 for White, 1 for Black),
+    blending the Board's running middlegame and endgame scores by the game phase.
+    """
+
+    phase = min(board.phase, TOTAL_PHASE)
+    # Rounding toward zero keeps a position and its mirror image scored the same for each player.
+    score = int((board.middlegame_score * phase + board.endgame_score * (TOTAL_PHASE - phase)) / TOTAL_PHASE)
+    return -score if side else score
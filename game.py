@@ -0,0 +1,214 @@
+"""
+Game class
+Keeps the state of a game that is not part of the position on
+the Board: whose turn it is, the moves played so far, and the
+square a Pawn that has just moved two spaces passed over, where
+it can be captured en passant.
+
+The move log is an array of 16-bit encoded moves (see move.py)
+allocated once when the Game is created and used as a ring
+buffer: once it is full, each new move overwrites the oldest
+one. A Game that runs for any number of moves therefore keeps
+at most capacity moves, two bytes each. The Board's undo stack
+is cut back to one entry fewer, so that any move which can still
+be taken back has the move before it in the log. The last move,
+and from it the en passant square, can always be read without
+looking further back in the log.
+
+The Game also keeps the halfmove clock (the number of moves since
+the last capture or Pawn move) after each move, in a second ring
+buffer beside the log, so that taking a move back restores it.
+"""
+
+from array import array
+
+from board import Board, SQUARE_NAMES, SQUARES, PAWN, WHITE, BLACK, side_of, iter_squares
+from attacks import PAWN_ATTACKS
+from move import CAPTURE, DOUBLE_PUSH, EN_PASSANT, encode_move, move_name
+from position import opening_board
+
+DEFAULT_CAPACITY = 1024
+
+
+class Game:
+    """
+    A game played on a Board, from the opening position (with the Kings) unless another Board is given.
+    """
+
+    def __init__(self, board=None, color=WHITE, capacity=DEFAULT_CAPACITY, en_passant=None, halfmove=0,
+                 fullmove=1):
+        if capacity < 1:
+            raise ValueError("A Game must keep at least one move.")
+
+        self.board = opening_board() if board is None else board
+        self.side = side_of(color)
+        if en_passant is not None and not self._could_pass(en_passant):
+            raise ValueError("No Pawn can have just passed over " + SQUARES[en_passant][2] + ".")
+        self.capacity = capacity
+        self.log = array("H", bytes(2 * capacity))
+        self.clocks = array("H", bytes(2 * capacity))
+
+        # The number of moves played, including those no longer kept in the log.
+        self.plies = 0
+
+        # The en passant square, halfmove clock, and move number when the Game started, before any
+        # move was played.
+        self._start_en_passant = en_passant
+        self._start_halfmove = halfmove
+        self._start_fullmove = fullmove
+        self._start_side = self.side
+
+    def _could_pass(self, index):
+        # The other player's Pawn must stand just beyond the square, on its fourth rank, with the
+        # square and the one it started from both empty.
+        board = self.board
+        if self.side == WHITE:
+            rank, ahead = 5, -8
+        else:
+            rank, ahead = 2, 8
+        if index >> 3 != rank or board.occupied >> index & 1 or board.occupied >> (index - ahead) & 1:
+            return False
+        return bool(board.occupancy(1 - self.side, PAWN) >> (index + ahead) & 1)
+
+    @classmethod
+    def from_fen(cls, fen, capacity=DEFAULT_CAPACITY):
+        """
+        Starts a Game from a position in Forsyth-Edwards Notation (FEN), including the player
+        to move, the en passant square, and the move counters. Raises ValueError if no Pawn of
+        the other player can have just passed over the en passant square.
+        """
+
+        fields = fen.split()
+        color = BLACK if fields[1:2] == ["b"] else WHITE
+        en_passant = SQUARE_NAMES.get(fields[3]) if len(fields) > 3 else None
+        halfmove = int(fields[4]) if len(fields) > 4 else 0
+        fullmove = int(fields[5]) if len(fields) > 5 else 1
+        if halfmove < 0 or fullmove < 1:
+            raise ValueError("Bad FEN move counters: " + " ".join(fields[4:6]))
+        return cls(Board.from_fen(fen), color, capacity, en_passant, halfmove, fullmove)
+
+    def __len__(self):
+        return self.plies
+
+    @property
+    def last_move(self):
+        """
+        The last move played, or None if no move has been played.
+        """
+
+        if not self.plies:
+            return None
+        return self.log[(self.plies - 1) % self.capacity]
+
+    @property
+    def en_passant(self):
+        """
+        The number of the square a Pawn can capture en passant onto, or None. This is the
+        square passed over by the last move, if it was a Pawn moving two spaces.
+        """
+
+        if not self.plies:
+            return self._start_en_passant
+        move = self.log[(self.plies - 1) % self.capacity]
+        if not move >> 12 & DOUBLE_PUSH:
+            return None
+        return ((move & 63) + ((move >> 6) & 63)) // 2
+
+    @property
+    def halfmove(self):
+        """
+        The number of moves played since the last capture or Pawn move.
+        """
+
+        if not self.plies:
+            return self._start_halfmove
+        return self.clocks[(self.plies - 1) % self.capacity]
+
+    @property
+    def fullmove(self):
+        """
+        The move number, which starts at 1 and goes up after each move by Black.
+        """
+        return self._start_fullmove + (self.plies + (self._start_side == BLACK)) // 2
+
+    def to_fen(self):
+        """
+        Gets the position in Forsyth-Edwards Notation (FEN), with the player to move, the
+        en passant square, and the move counters.
+        """
+        return self.board.to_fen(self.side, self.en_passant, self.halfmove, self.fullmove)
+
+    def moves(self):
+        """
+        Gets the moves kept in the log, from the oldest to the last one played.
+        """
+
+        kept = min(self.plies, self.capacity)
+        return [self.log[ply % self.capacity] for ply in range(self.plies - kept, self.plies)]
+
+    def legal_moves(self):
+        """
+        Gets every legal move for the player to move, including captures en passant.
+        """
+
+        board = self.board
+        side = self.side
+        moves = board.legal_moves(side)
+
+        target = self.en_passant
+        if target is not None:
+            pawns = PAWN_ATTACKS[1 - side][target] & board.occupancy(side, PAWN)
+            for origin in iter_squares(pawns):
+                # Taking a Pawn en passant empties two squares on one rank, which can expose
+                # the King in a way the pin check does not see, so each one is tried out.
+                move = encode_move(origin, target, CAPTURE | EN_PASSANT)
+                board.make_move(move)
+                if not board.in_check(side):
+                    moves.append(move)
+                board.unmake_move()
+        return moves
+
+    def play(self, move, moves=None):
+        """
+        Plays an encoded move for the player to move and records it. Raises ValueError if the
+        move is not legal. If the legal moves are already known, passing them (as got from
+        legal_moves in this position) saves generating them again.
+        """
+
+        if move not in (self.legal_moves() if moves is None else moves):
+            raise ValueError("Illegal move: " + move_name(move))
+        resets_clock = move >> 12 & CAPTURE or self.board.squares[move & 63].kind == PAWN
+        halfmove = 0 if resets_clock else min(self.halfmove + 1, 0xFFFF)
+        self.board.make_move(move)
+
+        self.log[self.plies % self.capacity] = move
+        self.clocks[self.plies % self.capacity] = halfmove
+        self.plies += 1
+        self.side = 1 - self.side
+
+        undo_stack = self.board.undo_stack
+        if len(undo_stack) >= self.capacity:
+            del undo_stack[:len(undo_stack) - self.capacity + 1]
+
+    def play_name(self, name):
+        """
+        Plays a move given in coordinate notation, e.g. e2e4. Raises ValueError if it is not legal.
+        """
+
+        for move in self.legal_moves():
+            if move_name(move) == name:
+                self.play(move)
+                return move
+        raise ValueError("Illegal move: " + name)
+
+    def take_back(self):
+        """
+        Takes back the last move. Raises ValueError if there is no move left to take back, either
+        because none has been played or because it is older than the log keeps.
+        """
+
+        if not self.plies or not self.board.undo_stack:
+            raise ValueError("No move to take back.")
+        self.board.unmake_move()
+        self.plies -= 1
+        self.side = 1 - self.side
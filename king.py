@@ -0,0 +1,45 @@
+"""
+King class
+A King moves and captures one space in any direction:
+along its rank, along its file, or diagonally.
+
+A King must never be left in check. The King's own move and
+capture methods only enforce where it may go; keeping it out
+of check is left to legal move generation (see legal.py).
+
+Castling is not supported yet.
+"""
+
+from piece import *
+from board import *
+from attacks import KING_ATTACKS
+
+
+class King(Piece):
+
+    __slots__ = ()
+    kind = KING
+
+    def __init__(self, color):
+        super().__init__(color)
+
+    def move_rule(self, board, target):
+        """
+        A king moves one space up, down, left, right, or diagonally.
+        """
+
+        if not KING_ATTACKS[self.current_space.index] & target.bit:
+            return Reason.KING_MOVE
+        return Reason.LEGAL
+
+    def capture_rule(self, board, target):
+        """
+        A king captures in the same way as it moves, on any space next to it.
+        """
+
+        if not KING_ATTACKS[self.current_space.index] & target.bit:
+            return Reason.KING_CAPTURE
+        return Reason.LEGAL
+
+    def attacks_from(self, index, occupied):
+        return KING_ATTACKS[index]
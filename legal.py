@@ -0,0 +1,135 @@
+"""
+Legal moves
+Narrows the moves the pieces generate down to those that do not
+leave the player's own King in check, without playing each move
+to find out.
+
+The pieces giving check and the pieces pinned against the King
+are found once for each position, and then:
+    - with two pieces giving check, only the King may move;
+    - with one, any other move must capture the checking piece
+      or block its line to the King;
+    - a pinned piece may only move along the line of its pin;
+    - the King may not move to any square the other player
+      attacks, including the squares behind it on the line of a
+      sliding piece giving check, which the King only hides
+      while it stands in the way.
+A player without a King on the board has nothing to keep out of
+check, so every move they can make is legal.
+"""
+
+from board import PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, side_of, iter_squares
+from attacks import (KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS, ROOK_RAYS, BISHOP_RAYS, BETWEEN,
+                     rook_attacks, bishop_attacks)
+
+
+def king_square(board, side):
+    """
+    Gets the square number of the given player's King, or None if they have no King.
+    """
+
+    kings = board.type_occupancy[KING] & board.color_occupancy[side]
+    if not kings:
+        return None
+    return (kings & -kings).bit_length() - 1
+
+
+def checkers(board, side):
+    """
+    Gets the bitboard of the other player's pieces giving check to the given player's King.
+    """
+
+    king = king_square(board, side)
+    if king is None or not board.is_attacked(king, 1 - side):
+        return 0
+
+    types = board.type_occupancy
+    occupied = board.occupied
+    return board.color_occupancy[1 - side] & (
+        KNIGHT_ATTACKS[king] & types[KNIGHT] |
+        PAWN_ATTACKS[side][king] & types[PAWN] |
+        KING_ATTACKS[king] & types[KING] |
+        rook_attacks(king, occupied) & (types[ROOK] | types[QUEEN]) |
+        bishop_attacks(king, occupied) & (types[BISHOP] | types[QUEEN]))
+
+
+def pins(board, side):
+    """
+    Gets the given player's pinned pieces, as a dictionary from each pinned piece's square to the
+    bitboard of squares it may still move to: those between the King and the pinning piece, and the
+    pinning piece's own square.
+    """
+
+    king = king_square(board, side)
+    if king is None:
+        return {}
+
+    types = board.type_occupancy
+    occupied = board.occupied
+    own = board.color_occupancy[side]
+    snipers = board.color_occupancy[1 - side] & (
+        ROOK_RAYS[king] & (types[ROOK] | types[QUEEN]) |
+        BISHOP_RAYS[king] & (types[BISHOP] | types[QUEEN]))
+
+    pinned = {}
+    for sniper in iter_squares(snipers):
+        line = BETWEEN[king][sniper]
+        blockers = line & occupied
+        # Exactly one piece in the way, and it is the player's own.
+        if blockers and not blockers & (blockers - 1) and blockers & own:
+            pinned[blockers.bit_length() - 1] = line | (1 << sniper)
+    return pinned
+
+
+def legal_moves(board, color):
+    """
+    Gets every legal move the given player can make, as a list of encoded moves (see move.py).
+    """
+
+    side = side_of(color)
+    moves = board.generate_moves(side)
+    king = king_square(board, side)
+    if king is None:
+        return moves
+
+    checking = checkers(board, side)
+    pinned = pins(board, side)
+
+    danger = board.attack_maps[1 - side]
+    allowed = ~0
+    if checking:
+        squares = board.squares
+        without_king = board.occupied & ~(1 << king)
+        for checker in iter_squares(checking):
+            danger |= squares[checker].attacks_from(checker, without_king)
+        if checking & (checking - 1):
+            allowed = 0
+        else:
+            checker = checking.bit_length() - 1
+            allowed = checking | BETWEEN[king][checker]
+
+    legal = []
+    for move in moves:
+        origin = move & 63
+        target = (move >> 6) & 63
+        if origin == king:
+            if not danger >> target & 1:
+                legal.append(move)
+        elif allowed >> target & 1 and (origin not in pinned or pinned[origin] >> target & 1):
+            legal.append(move)
+    return legal
+
+
+def is_checkmate(board, color):
+    """
+    Checks whether the given player is in check and has no legal move.
+    """
+    return bool(checkers(board, side_of(color))) and not legal_moves(board, color)
+
+
+def is_stalemate(board, color):
+    """
+    Checks whether the given player is not in check but has no legal move.
+    """
+    return king_square(board, side_of(color)) is not None and not checkers(board, side_of(color)) \
+        and not legal_moves(board, color)
@@ -0,0 +1,43 @@
+"""
+Move encoding
+A move is packed into a single integer so that move lists
+stay compact: bits 0-5 hold the number of the square the
+piece moves from, bits 6-11 the number of the square it
+moves to, and the bits above those hold flags describing
+the move. Square numbers follow board.py, from a1 = 0 to
+h8 = 63.
+"""
+
+from board import SQUARES
+
+CAPTURE = 1
+DOUBLE_PUSH = 2
+EN_PASSANT = 4
+PROMOTION = 8
+
+
+def encode_move(origin, target, flags=0):
+    return origin | (target << 6) | (flags << 12)
+
+
+def move_origin(move):
+    return move & 63
+
+
+def move_target(move):
+    return (move >> 6) & 63
+
+
+def move_flags(move):
+    return move >> 12
+
+
+def square_name(index):
+    return SQUARES[index][2]
+
+
+def move_name(move):
+    """
+    Gets the move in coordinate notation, e.g. e2e4.
+    """
+    return square_name(move_origin(move)) + square_name(move_target(move))
@@ -0,0 +1,135 @@
+"""
+Move ordering
+Scores moves so that the search tries the ones most likely to
+be best first, since alpha-beta cuts off the most when the
+best move comes first. In order:
+    - the move the transposition table found best here before;
+    - captures, the most valuable victim first and, for the
+      same victim, the least valuable attacker first (MVV-LVA);
+    - killer moves: quiet moves that caused a cutoff at the
+      same ply elsewhere in the search;
+    - other quiet moves, by their history score: how often,
+      and how deep, the same move from and to the same squares
+      caused a cutoff.
+
+Moves are not sorted up front. The search picks the best-scored
+move left each time it needs the next one, which is cheaper when
+a cutoff comes after the first few moves, as it usually does.
+"""
+
+from array import array
+
+from board import PAWN
+from move import CAPTURE, EN_PASSANT
+
+MAX_PLY = 128
+
+HASH_SCORE = 1 << 30
+CAPTURE_SCORE = 1 << 28
+KILLER_SCORE = 1 << 27
+
+# History scores are halved when one reaches this, so that they stay below the killer score.
+HISTORY_LIMIT = 1 << 26
+
+
+def mvv_lva(board, move):
+    """
+    Scores a capture by its victim's piece type, then by its attacker's, so that taking a more
+    valuable piece, or taking with a less valuable one, scores higher. Piece type numbers
+    increase with piece value (see board.py).
+    """
+
+    squares = board.squares
+    attacker = squares[move & 63].kind
+    if move >> 12 & EN_PASSANT:
+        return PAWN * 8 - attacker
+    return squares[(move >> 6) & 63].kind * 8 - attacker
+
+
+def pick(moves, scores, start):
+    """
+    Swaps the best-scored move from start onward into position start, with its score.
+    """
+
+    best = start
+    best_score = scores[start]
+    for index in range(start + 1, len(moves)):
+        if scores[index] > best_score:
+            best = index
+            best_score = scores[index]
+    if best != start:
+        moves[start], moves[best] = moves[best], moves[start]
+        scores[start], scores[best] = scores[best], scores[start]
+
+
+class MoveOrdering:
+    """
+    The killer moves at each ply and the history score of each move from one square to another,
+    gathered as the search goes.
+    """
+
+    def __init__(self, max_ply=MAX_PLY):
+        self.max_ply = max_ply
+        # Two killer moves per ply. 0 (a1 to a1) is never a real move, so it marks an empty slot.
+        self.killers = array("H", bytes(4 * max_ply))
+        # history[origin + target * 64], which is move & 4095 for an encoded move (see move.py).
+        self.history = array("l", bytes(array("l").itemsize * 64 * 64))
+
+    def score(self, board, moves, hash_move=None, ply=0):
+        """
+        Gets the ordering score of each move, as a list in the same order.
+        """
+
+        history = self.history
+        if ply < self.max_ply:
+            first_killer = self.killers[2 * ply]
+            second_killer = self.killers[2 * ply + 1]
+        else:
+            first_killer = second_killer = 0
+
+        scores = []
+        for move in moves:
+            if move == hash_move:
+                scores.append(HASH_SCORE)
+            elif move >> 12 & CAPTURE:
+                scores.append(CAPTURE_SCORE + mvv_lva(board, move))
+            elif move == first_killer:
+                scores.append(KILLER_SCORE + 1)
+            elif move == second_killer:
+                scores.append(KILLER_SCORE)
+            else:
+                scores.append(history[move & 4095])
+        return scores
+
+    def record_cutoff(self, move, depth, ply):
+        """
+        Records a quiet move that caused a cutoff, as a killer at its ply and in the history.
+        Captures are already ordered first, so they are not recorded.
+        """
+
+        if move >> 12 & CAPTURE:
+            return
+
+        if ply < self.max_ply and self.killers[2 * ply] != move:
+            self.killers[2 * ply + 1] = self.killers[2 * ply]
+            self.killers[2 * ply] = move
+
+        index = move & 4095
+        self.history[index] += depth * depth
+        if self.history[index] >= HISTORY_LIMIT:
+            self.age()
+
+    def age(self):
+        """
+        Halves every history score, so that what was learned recently counts for more.
+        """
+
+        history = self.history
+        for index in range(len(history)):
+            history[index] >>= 1
+
+    def clear(self):
+        for index in range(len(self.killers)):
+            self.killers[index] = 0
+        for index in range(len(self.history)):
+            self.history[index] = 0
@@ -0,0 +1,179 @@
+"""
+Parallel runner
+Spreads perft counts and batch move validation across worker
+processes with a ProcessPoolExecutor, so that they are not
+limited to one core.
+
+Work is split into chunks, and each chunk is sent to a worker
+as encoded positions (see position.py) rather than as Board
+objects. Each worker reports how much work it did and how
+long it spent on it, and the runner adds these up by worker
+process so that the throughput of each worker can be compared.
+
+Usage: python parallel.py [depth] [workers] [position name]
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from board import side_of
+from perft import REFERENCE_POSITIONS, setup_board, perft
+import position
+
+
+class RunReport:
+    """
+    The result of a parallel run: the total count (nodes for perft, moves for validation), the
+    wall-clock time, and for each worker process the count and time spent working.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.elapsed = 0.0
+        self.workers = {}
+
+    def add(self, worker, count, seconds):
+        total_count, total_seconds = self.workers.get(worker, (0, 0.0))
+        self.workers[worker] = (total_count + count, total_seconds + seconds)
+        self.total += count
+
+    def per_second(self):
+        return self.total / self.elapsed if self.elapsed else 0.0
+
+    def worker_rates(self):
+        """
+        Gets the count per second of busy time for each worker process.
+        """
+        return {worker: (count / seconds if seconds else 0.0) for worker, (count, seconds) in self.workers.items()}
+
+
+def _chunks(items, chunk_size):
+    for start in range(0, len(items), chunk_size):
+        yield items[start:start + chunk_size]
+
+
+def _split(board, side, depth):
+    """
+    Plays out every sequence of depth moves and gets the encoding of each position reached,
+    with the side to move there.
+    """
+
+    if depth == 0:
+        return [(position.encode(board), side)]
+
+    leaves = []
+    for move in board.legal_moves(side):
+        board.make_move(move)
+        leaves.extend(_split(board, 1 - side, depth - 1))
+        board.unmake_move()
+    return leaves
+
+
+def _perft_chunk(chunk, depth):
+    start = time.perf_counter()
+    nodes = [perft(position.decode(encoded), side, depth) for encoded, side in chunk]
+    return os.getpid(), nodes, time.perf_counter() - start
+
+
+def parallel_perft(board, color, depth, workers=None, split_depth=1, chunk_size=4):
+    """
+    Counts perft nodes to the given depth by playing the first split_depth moves here and counting
+    the rest of each branch in a worker process. Returns a RunReport whose total is the node count.
+    """
+
+    report = RunReport()
+    start = time.perf_counter()
+
+    split_depth = min(split_depth, depth)
+    leaves = _split(board, side_of(color), split_depth)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_perft_chunk, chunk, depth - split_depth) for chunk in _chunks(leaves, chunk_size)]
+        for future in futures:
+            worker, nodes, seconds = future.result()
+            report.add(worker, sum(nodes), seconds)
+
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def perft_positions(positions, depth, workers=None, chunk_size=16):
+    """
+    Counts perft nodes to the given depth for each of a list of (Board, color) pairs. Returns the
+    list of counts, in the same order, and a RunReport.
+    """
+
+    report = RunReport()
+    start = time.perf_counter()
+
+    encoded = [(position.encode(board), side_of(color)) for board, color in positions]
+    counts = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_perft_chunk, chunk, depth) for chunk in _chunks(encoded, chunk_size)]
+        for future in futures:
+            worker, nodes, seconds = future.result()
+            report.add(worker, sum(nodes), seconds)
+            counts.extend(nodes)
+
+    report.elapsed = time.perf_counter() - start
+    return counts, report
+
+
+def _validate_chunk(pieces, moved, board_ids, origins, targets):
+    import batch
+
+    start = time.perf_counter()
+    reasons = batch.validate(pieces, moved, board_ids, origins, targets)
+    return os.getpid(), reasons, time.perf_counter() - start
+
+
+def parallel_validate(pieces, moved, board_ids, origins, targets, workers=None, chunk_size=100000):
+    """
+    Runs batch.validate over chunks of the moves in worker processes. Each chunk is sent only the
+    boards its moves are on. Returns the array of reason codes and a RunReport. Requires NumPy.
+    """
+
+    import numpy as np
+
+    report = RunReport()
+    start = time.perf_counter()
+
+    board_ids = np.asarray(board_ids)
+    origins = np.asarray(origins)
+    targets = np.asarray(targets)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = []
+        for first in range(0, len(board_ids), chunk_size):
+            last = first + chunk_size
+            used, chunk_ids = np.unique(board_ids[first:last], return_inverse=True)
+            futures.append(executor.submit(_validate_chunk, pieces[used], moved[used], chunk_ids,
+                                           origins[first:last], targets[first:last]))
+
+        results = []
+        for future in futures:
+            worker, reasons, seconds = future.result()
+            report.add(worker, len(reasons), seconds)
+            results.append(reasons)
+
+    report.elapsed = time.perf_counter() - start
+    reasons = np.concatenate(results) if results else np.zeros(0, dtype=np.int8)
+    return reasons, report
+
+
+if __name__ == "__main__":
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    names = [" ".join(sys.argv[3:])] if len(sys.argv) > 3 else list(REFERENCE_POSITIONS)
+    for name in names:
+        white, black, color, expected = REFERENCE_POSITIONS[name]
+        report = parallel_perft(setup_board(white, black), color, depth, workers, split_depth=min(2, depth))
+        if depth in expected:
+            assert report.total == expected[depth]
+        print("{:<16} depth {}  {:>10} nodes  {:8.3f} s  {:>10.0f} nodes/s".format(
+            name, depth, report.total, report.elapsed, report.per_second()))
+        for worker, rate in sorted(report.worker_rates().items()):
+            count, seconds = report.workers[worker]
+            print("    worker {:>7}  {:>10} nodes  {:8.3f} s  {:>10.0f} nodes/s".format(worker, count, seconds, rate))
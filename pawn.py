@@ -11,6 +11,11 @@ A pawn must capture diagonally ahead, meaning that it
 cannot move straight forward onto an occupied space. It can
 also never jump over any other piece, nor move backward.
 
+A pawn that has just moved two spaces forward can be captured
+en passant by an enemy pawn beside it, as if it had moved only
+one space. This is only allowed on the very next move, so it
+needs the Game (see game.py), which knows the last move played.
+
 When a pawn reaches the last rank (8 for the White player,
 1 for the Black player) it must promote into another piece.
 
@@ -20,6 +25,8 @@ Author: Daniel Edades
 
 from piece import *
 from board import *
+from attacks import PAWN_ATTACKS
+from move import CAPTURE, DOUBLE_PUSH, PROMOTION, encode_move
 from enum import Enum
 
 class Direction(Enum):
@@ -28,97 +35,141 @@ class Direction(Enum):
 
 class Pawn(Piece):
 
+    __slots__ = ()
+    kind = PAWN
+
     def __init__(self, color):
         super().__init__(color)
 
-    def move(self, board, target):
+    def move_rule(self, board, target):
         """
         If a pawn has not already moved, it may move one or two spaces up.
         If a pawn has already moved, it may only move one space vertically.
         """
 
-        if self.current_space:
-            current_rank = self.current_space.rank
-            current_file = self.current_space.file
-            direction = 0
+        current_index = self.current_space.index
+        current_rank = current_index >> 3
+        current_file = current_index & 7
+        target_rank = target.index >> 3
+        target_file = target.index & 7
 
-            # The direction a Pawn moves depends on its color. White Pawns move up (i.e. from lower ranks to
-            # higher ranks) while black Pawns move down, from higher ranks to lower ranks. Thus, the difference
-            # between a black Pawn's ending and starting ranks will be negative. Multiply this by -1 to
-            # turn it into a positive value. If the result is negative, the Pawn attempted to move backward.
+        # The direction a Pawn moves depends on its color. White Pawns move up (i.e. from lower ranks to
+        # higher ranks) while black Pawns move down, from higher ranks to lower ranks. Thus, the difference
+        # between a black Pawn's ending and starting ranks will be negative. Multiply this by -1 to
+        # turn it into a positive value. If the result is negative, the Pawn attempted to move backward.
 
-            if self.color == PieceColor.WHITE:
-                direction = Direction.UP.value
-            else:
-                direction = Direction.DOWN.value
+        if self.color == PieceColor.WHITE:
+            direction = Direction.UP.value
+        else:
+            direction = Direction.DOWN.value
 
-            # Pawn moves two Spaces on first move
-            if not self.moved and direction * (target.rank - current_rank) == 2 and target.file == current_file:
+        advance = direction * (target_rank - current_rank)
 
-                next_space = board.get_space(self.current_space.file, self.current_space.rank + direction)
-                second_space = board.get_space(next_space.file, next_space.rank + (2 * direction))
+        # Pawn moves two Spaces on first move
+        if not self.moved and advance == 2 and target_file == current_file:
+            if target.current_piece:
+                return Reason.PAWN_CAPTURE_ONLY_DIAGONALLY
+            if board.squares[current_index + 8 * direction]:
+                return Reason.PAWN_JUMP
+            return Reason.LEGAL
 
-                if next_space.current_piece is None and second_space.current_piece is None:
-                    super().move(target)
+        # Pawn tries to move two Spaces after first move
+        elif self.moved and advance == 2 and target_file == current_file:
+            return Reason.PAWN_TWO_AFTER_FIRST_MOVE
 
-                else:
-                    if second_space.current_piece:
-                        raise IllegalMoveException("A Pawn may only capture diagonally.")
-                    elif next_space.current_piece:
-                        raise IllegalMoveException("A Pawn may not jump over any other pieces.")
+        # Pawn moves one space
+        elif advance == 1 and current_file == target_file:
+            return Reason.LEGAL
 
-            # Pawn tries to move two Spaces after first move
-            elif self.moved and direction * (target.rank - current_rank) == 2 and target.file == current_file:
+        # Pawn tried to move laterally or diagonally
+        elif target_file != current_file:
+            return Reason.PAWN_CHANGE_FILE
 
-                raise IllegalMoveException("A Pawn may only move two Spaces on its first move.")
+        # Pawn tried to move more than two Spaces
+        elif advance > 2:
+            return Reason.PAWN_TOO_FAR
 
-            # Pawn moves one space
-            elif direction * (target.rank - current_rank) == 1 and current_file == target.file:
+        elif advance == 0:
+            return Reason.PAWN_SAME_SPACE
 
-                next_space = board.get_space(self.current_space.file, direction * self.current_space.rank + direction)
-                super().move(target)
+        return Reason.PAWN_BACKWARD
 
-            # Pawn tried to move laterally or diagonally
-            elif target.file != current_file:
-                raise IllegalMoveException("A Pawn may not move to a different file unless capturing.")
+    def capture_rule(self, board, target):
+        """
+        Pawns must capture one space ahead and one space to either the left or the right.
+        """
 
-            # Pawn tried to move mo
-            elif direction * (target.rank - current_rank) > 2:
-                raise IllegalMoveException("A Pawn may never move more than two Spaces at a time.")
+        if not PAWN_ATTACKS[self.side][self.current_space.index] & target.bit:
+            return Reason.PAWN_CAPTURE
+        return Reason.LEGAL
 
-            elif direction * (target.rank - current_rank) == 0:
-                raise IllegalMoveException("A Pawn must end up on a different Space from the one it started on when" +
-                                           " moving.")
+    def is_legal_capture(self, board, target, game=None):
+        """
+        Checks a capture as for any other piece. Given the Game, a Pawn may also capture
+        en passant onto the empty Space the other player's Pawn passed over with its last move.
+        """
 
-            elif direction * (target.rank - current_rank) < 0:
-                raise IllegalMoveException("A Pawn may not move backward.")
+        reason = super().is_legal_capture(board, target)
+        if reason is Reason.NOTHING_TO_CAPTURE and game is not None and \
+                target.index == game.en_passant and game.side == self.side:
+            return Reason.LEGAL
+        return reason
 
-        else:
-            raise super().IllegalMoveException("That piece is not on the board.")
-
-    def capture(self, target):
-        if self.current_space:
-            current_rank = self.current_space.rank
-            current_file = self.current_space.file
+    def move(self, board, target):
+        super().move(target, board)
 
-            direction = 0
-            if self.color is PieceColor.WHITE:
-                direction = Direction.UP.value
-            else:
-                direction = Direction.DOWN.value
+    def capture(self, target, board=None, game=None):
+        """
+        Captures on the target Space. Given the Game, this includes capturing en passant, but
+        only the piece is moved; to record the move in the Game, play it with Game.play instead.
+        """
 
-            # Pawns must capture one space ahead and one space to either the left or the right.
-            if (direction * (target.rank - current_rank)) == 1 and abs(ord(target.file) - ord(current_file)) == 1:
-                super().capture(target)
+        if game is not None and self.is_legal_capture(board, target, game) is Reason.LEGAL and \
+                target.current_piece is None:
+            # En passant: the captured Pawn stands beside this one, on the target's file.
+            passed = target.board.space_at((self.current_space.index & 56) | (target.index & 7))
+            passed.current_piece.remove()
+            self._relocate(target)
+        else:
+            super().capture(target, board)
 
-            else:
-                raise IllegalMoveException("A Pawn may only capture one space ahead diagonally.")
+    def attacks_from(self, index, occupied):
+        return PAWN_ATTACKS[self.side][index]
 
-        # TODO: Capture en passant
-        # Requires a Game class which keeps track of previous moves.
+    def move_bitboard(self, board):
+        """
+        A Pawn moves one Space forward onto an empty Space, or two if it
+        has not moved yet and both Spaces ahead of it are empty.
+        """
 
-        else:
-            raise IllegalMoveException("That piece is not on the board.")
+        index = self.current_space.index
+        step = 8 if self.side == WHITE else -8
+        next_index = index + step
+
+        if not 0 <= next_index < 64 or board.occupied & (1 << next_index):
+            return 0
+
+        targets = 1 << next_index
+        second_index = next_index + step
+        if not self.moved and 0 <= second_index < 64 and not board.occupied & (1 << second_index):
+            targets |= 1 << second_index
+        return targets
+
+    def generate_moves(self, board, moves):
+        origin = self.current_space.index
+        last_rank = 7 if self.side == WHITE else 0
+
+        for target in iter_squares(self.move_bitboard(board)):
+            flags = DOUBLE_PUSH if abs(target - origin) == 16 else 0
+            if target // 8 == last_rank:
+                flags |= PROMOTION
+            moves.append(encode_move(origin, target, flags))
+
+        for target in iter_squares(self.capture_bitboard(board)):
+            flags = CAPTURE
+            if target // 8 == last_rank:
+                flags |= PROMOTION
+            moves.append(encode_move(origin, target, flags))
 
     def promote(self, board, choice):
         # TODO: Accept choice of promotion class
@@ -0,0 +1,112 @@
+"""
+Perft
+Counts the positions reachable from a starting position
+by playing every possible sequence of moves to a fixed
+depth. The counts check that move generation follows the
+piece rules (any change to the rules or to generation that
+changes a count is a bug in one or the other), and timing
+them measures move generation throughput.
+
+Only legal moves are counted: a move that leaves the player's
+own King in check is not (see legal.py). The reference positions
+below have no kings, so every generated move is legal there.
+They only use the pieces that are implemented (pawns, knights
+and rooks), so their counts differ from the published counts
+for full chess positions. They were found by trying every target
+Space through the piece classes' own move and capture methods.
+
+Usage: python perft.py [depth] [position name]
+"""
+
+import sys
+import time
+
+from board import side_of
+from piece import PieceColor
+from position import STANDARD_WHITE, STANDARD_BLACK, setup_board
+
+# Each position lists the white pieces, the black pieces, the player to move, and the
+# number of positions reachable at each depth.
+REFERENCE_POSITIONS = {
+    "opening": (
+        STANDARD_WHITE,
+        STANDARD_BLACK,
+        PieceColor.WHITE,
+        {1: 20, 2: 400, 3: 8246, 4: 169832},
+    ),
+    "open files": (
+        "Ra1 Rh1 Nc3 Nf3 Pa2 Pb2 Pe4 Pg2",
+        "Ra8 Rf8 Nc6 Nd7 Pa7 Pb7 Pd5 Ph7",
+        PieceColor.WHITE,
+        {1: 41, 2: 1476, 3: 53831, 4: 1816427},
+    ),
+    "promotion race": (
+        "Rb1 Pc6 Pg7 Ph2",
+        "Nh8 Rb8 Pa2 Pf4",
+        PieceColor.BLACK,
+        {1: 19, 2: 329, 3: 5337, 4: 85599},
+    ),
+}
+
+
+def perft(board, color, depth):
+    """
+    Counts the positions reached after every sequence of depth moves, starting with the given player.
+    The Board is left as it was found.
+    """
+
+    side = side_of(color)
+    moves = board.legal_moves(side)
+    if depth <= 1:
+        return len(moves) if depth == 1 else 1
+
+    nodes = 0
+    for move in moves:
+        board.make_move(move)
+        nodes += perft(board, 1 - side, depth - 1)
+        board.unmake_move()
+    return nodes
+
+
+def divide(board, color, depth):
+    """
+    Counts the positions reached after each of the player's moves separately, as a dictionary of
+    move to count. Comparing these against another count narrows a wrong total down to one move.
+    """
+
+    side = side_of(color)
+    counts = {}
+    for move in board.legal_moves(side):
+        board.make_move(move)
+        counts[move] = perft(board, 1 - side, depth - 1)
+        board.unmake_move()
+    return counts
+
+
+def benchmark(name, depth):
+    """
+    Runs perft on one of the reference positions and returns the node count, the time it took in
+    seconds, and the nodes per second. Raises AssertionError if the count does not match the
+    reference count for that depth.
+    """
+
+    white, black, color, expected = REFERENCE_POSITIONS[name]
+    board = setup_board(white, black)
+
+    start = time.perf_counter()
+    nodes = perft(board, color, depth)
+    elapsed = time.perf_counter() - start
+
+    if depth in expected:
+        assert nodes == expected[depth], "{}: expected {} nodes at depth {}, counted {}".format(
+            name, expected[depth], depth, nodes)
+    return nodes, elapsed, nodes / elapsed if elapsed else 0.0
+
+
+if __name__ == "__main__":
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    names = [" ".join(sys.argv[2:])] if len(sys.argv) > 2 else list(REFERENCE_POSITIONS)
+    for name in names:
+        nodes, elapsed, nodes_per_second = benchmark(name, depth)
+        print("{:<16} depth {}  {:>10} nodes  {:8.3f} s  {:>10.0f} nodes/s".format(
+            name, depth, nodes, elapsed, nodes_per_second))
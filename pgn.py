@@ -0,0 +1,271 @@
+"""
+PGN replay
+Reads games in Portable Game Notation from a file or any other
+source of lines, one game at a time, and replays each game's
+moves on a Board to check that every move is legal.
+
+Games are parsed lazily: only the game being replayed is held in
+memory, so an archive of any size can be checked in constant
+memory. Each move, written in Standard Algebraic Notation (SAN),
+is matched against the legal moves of the Game being replayed
+(see game.py), including captures en passant, so the piece
+classes' own rules decide what is legal.
+
+Only pawns, knights, rooks and kings are implemented, so a game
+is reported as unsupported from the first move that needs any
+other piece, castling, or promotion, and a game whose FEN tag
+sets up any other piece is unsupported from the start. A move
+that leaves the player's own King in check is illegal.
+
+A game from the opening position is replayed without its bishops
+and queens, whose home squares are kept as blocked squares. The
+game is unsupported from the first move that lands on one, passes
+through one, or is only illegal because of a check along a line
+through one, since the missing piece would decide it.
+
+Usage: python pgn.py archive.pgn
+"""
+
+import re
+import sys
+import time
+
+from attacks import BETWEEN
+from board import FILES, SQUARE_NAMES, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, iter_squares
+from legal import checkers, king_square
+from move import CAPTURE, PROMOTION, move_origin, move_target, move_flags
+from game import Game
+
+RESULTS = ("1-0", "0-1", "1/2-1/2", "*")
+
+LEGAL = "legal"
+ILLEGAL = "illegal"
+UNSUPPORTED = "unsupported"
+
+PIECE_KINDS = {"N": KNIGHT, "B": BISHOP, "R": ROOK, "Q": QUEEN, "K": KING}
+SUPPORTED_KINDS = (PAWN, KNIGHT, ROOK, KING)
+
+# The home squares of the bishops and queens, which are missing from the opening position.
+MISSING_SQUARES = sum(1 << SQUARE_NAMES[name] for name in ("c1", "d1", "f1", "c8", "d8", "f8"))
+
+_HEADER = re.compile(r'\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]')
+_TOKEN = re.compile(r"[{}();]|[^\s{}();]+")
+_MOVE_NUMBER = re.compile(r"^\d+\.*")
+_SAN = re.compile(r"^([NBRQK]?)([a-h]?)([1-8]?)(x?)([a-h][1-8])(=?[NBRQK])?$")
+
+
+class PgnGame:
+    """
+    One game as read from PGN: its tag pairs, its moves in SAN, and its result.
+    """
+
+    def __init__(self, headers, moves, result):
+        self.headers = headers
+        self.moves = moves
+        self.result = result
+
+
+class GameResult:
+    """
+    The outcome of replaying one game: LEGAL, ILLEGAL, or UNSUPPORTED, how many moves
+    (plies) were replayed before that was decided, and for an illegal or unsupported
+    game the move that stopped it.
+    """
+
+    def __init__(self, game, status, plies, move=None):
+        self.headers = game.headers
+        self.result = game.result
+        self.status = status
+        self.plies = plies
+        self.move = move
+
+
+def read_games(lines):
+    """
+    Yields a PgnGame for each game in an iterable of lines, such as an open file.
+    Comments, variations, and annotation glyphs are skipped.
+    """
+
+    headers = {}
+    moves = []
+    in_comment = False
+    variation_depth = 0
+
+    for line in lines:
+        if not in_comment and variation_depth == 0:
+            stripped = line.strip()
+            if stripped.startswith("%"):
+                continue
+            if stripped.startswith("["):
+                # A tag pair after moves starts a new game, even if the last one had no result.
+                if moves:
+                    yield PgnGame(headers, moves, "*")
+                    headers = {}
+                    moves = []
+                header = _HEADER.match(stripped)
+                if header:
+                    headers[header.group(1)] = header.group(2).replace('\\"', '"').replace("\\\\", "\\")
+                continue
+
+        for token in _TOKEN.findall(line):
+            if in_comment:
+                if token == "}":
+                    in_comment = False
+            elif token == "{":
+                in_comment = True
+            elif token == ";":
+                break
+            elif token == "(":
+                variation_depth += 1
+            elif token == ")":
+                variation_depth = max(0, variation_depth - 1)
+            elif variation_depth or token.startswith("$"):
+                continue
+            elif token in RESULTS:
+                yield PgnGame(headers, moves, token)
+                headers = {}
+                moves = []
+            else:
+                token = _MOVE_NUMBER.sub("", token)
+                if token:
+                    moves.append(token)
+
+    if headers or moves:
+        yield PgnGame(headers, moves, "*")
+
+
+def resolve_san(board, side, san, moves=None, blocked=0):
+    """
+    Finds the move written in SAN among the moves the player can make, which are the Board's
+    legal moves unless a list of moves is given. Returns the encoded move, or None if no legal
+    move (or more than one) matches. Raises ValueError for a move this project cannot play:
+    castling, promotion, a move by a piece that is not implemented, or a move onto or through
+    one of the blocked squares, which stand for pieces that are not implemented.
+    """
+
+    san = san.rstrip("+#!?")
+    if san.startswith(("O-O", "0-0")):
+        raise ValueError("Castling is not supported.")
+
+    parts = _SAN.match(san)
+    if not parts:
+        return None
+    letter, from_file, from_rank, capture, target, promotion = parts.groups()
+
+    kind = PIECE_KINDS[letter] if letter else PAWN
+    if kind not in SUPPORTED_KINDS:
+        raise ValueError("That piece is not supported.")
+    if promotion:
+        raise ValueError("Promotion is not supported.")
+
+    target_index = SQUARE_NAMES[target]
+    if blocked >> target_index & 1:
+        raise ValueError("That move needs a piece that is not supported.")
+
+    squares = board.squares
+    found = None
+    passes_blocked = False
+    for move in board.legal_moves(side) if moves is None else moves:
+        if move_target(move) != target_index:
+            continue
+        origin = move_origin(move)
+        if squares[origin].kind != kind:
+            continue
+        if from_file and FILES[origin & 7] != from_file:
+            continue
+        if from_rank and (origin >> 3) + 1 != int(from_rank):
+            continue
+        if capture and not move_flags(move) & CAPTURE:
+            continue
+        if move_flags(move) & PROMOTION:
+            raise ValueError("Promotion is not supported.")
+        if BETWEEN[origin][target_index] & blocked:
+            # The missing piece would be in the way, so this is not the move that was played.
+            passes_blocked = True
+            continue
+        if found is not None:
+            # Ambiguous moves are not legal SAN.
+            return None
+        found = move
+    if found is None and passes_blocked:
+        raise ValueError("That move needs a piece that is not supported.")
+    return found
+
+
+def _check_through_blocked(board, side, san, blocked):
+    """
+    Checks whether a move that is only illegal because it leaves the player's King in check
+    would be legal with pieces on the blocked squares, which stand between every piece giving
+    check and the King.
+    """
+
+    move = resolve_san(board, side, san, board.generate_moves(side), blocked)
+    if move is None:
+        return False
+
+    board.make_move(move)
+    king = king_square(board, side)
+    checking = checkers(board, side)
+    hidden = bool(checking) and all(BETWEEN[checker][king] & blocked for checker in iter_squares(checking))
+    board.unmake_move()
+    return hidden
+
+
+def replay_game(game):
+    """
+    Replays one PgnGame and returns its GameResult. The game starts from the position in
+    its FEN tag if it has one, and from the opening position otherwise.
+    """
+
+    # Only the last move is needed, for the en passant square, so the Game keeps no more.
+    if "FEN" in game.headers:
+        try:
+            current = Game.from_fen(game.headers["FEN"], capacity=1)
+        except ValueError:
+            return GameResult(game, UNSUPPORTED, 0)
+        blocked = 0
+    else:
+        current = Game(capacity=1)
+        blocked = MISSING_SQUARES
+    for ply, san in enumerate(game.moves):
+        moves = current.legal_moves()
+        try:
+            move = resolve_san(current.board, current.side, san, moves, blocked)
+            if move is None and blocked and _check_through_blocked(current.board, current.side, san, blocked):
+                raise ValueError("That move needs a piece that is not supported.")
+        except ValueError:
+            return GameResult(game, UNSUPPORTED, ply, san)
+        if move is None:
+            return GameResult(game, ILLEGAL, ply, san)
+        current.play(move, moves)
+    return GameResult(game, LEGAL, len(game.moves))
+
+
+def replay(lines):
+    """
+    Yields a GameResult for each game in an iterable of lines.
+    """
+
+    for game in read_games(lines):
+        yield replay_game(game)
+
+
+def replay_file(path):
+    """
+    Yields a GameResult for each game in a PGN file, reading it as it goes.
+    """
+
+    with open(path, encoding="utf-8", errors="replace") as pgn_file:
+        yield from replay(pgn_file)
+
+
+if __name__ == "__main__":
+    counts = {LEGAL: 0, ILLEGAL: 0, UNSUPPORTED: 0}
+    start = time.perf_counter()
+    for path in sys.argv[1:]:
+        for result in replay_file(path):
+            counts[result.status] += 1
+    elapsed = time.perf_counter() - start
+    games = sum(counts.values())
+    print("{} games in {:.3f} s ({:.0f} games/s): {} legal, {} illegal, {} unsupported".format(
+        games, elapsed, games / elapsed if elapsed else 0.0, counts[LEGAL], counts[ILLEGAL], counts[UNSUPPORTED]))
@@ -3,17 +3,31 @@ Piece class
 General behavior common to all pieces, includes
 moving, capturing, placement on the board, and removal from
 the board. The individual piece classes (which inherit from this)
-are responsible for enforcing their piece rules in their move and capture
-methods. If the subclass move or capture method determines the
-move or capture is legal, it should end with calling the move or
-capture method from this class, and pass it the target.
+are responsible for their own piece rules: where they may move
+and where they may capture, in their move_rule and capture_rule
+methods. The rules every piece follows (the piece must be on the
+board, a move must end on an empty Space, a capture must take a
+piece of the other color) are checked here, after the piece's own.
+
+Each piece can also be asked whether a move or capture is legal
+without trying it, through is_legal_move and is_legal_capture,
+which return a Reason rather than raising an exception. The move
+and capture methods check the same Reason and raise it as an
+exception, so both always agree.
+
+For generating moves in bulk, each piece class also describes
+the squares it attacks from any square as a bitboard (see
+board.py). The Board keeps these up to date as pieces move, and
+this class works out every move and capture the piece can make
+from them.
 
 Last modified: 3/29/2018
 Author: Daniel Edades
 """
 
 from enum import Enum
-from board import Space
+from board import Space, WHITE, BLACK, iter_squares
+from move import CAPTURE, encode_move
 
 class PieceColor(Enum):
     WHITE = 1
@@ -34,38 +48,199 @@ class IllegalPlacementException(Exception):
         return self.msg
 
 
+class Reason(Enum):
+    """
+    Why a move or capture is or is not legal.
+    """
+
+    LEGAL = 0
+    NOT_A_SPACE = 1
+    NOT_ON_BOARD = 2
+    TARGET_OCCUPIED = 3
+    NOTHING_TO_CAPTURE = 4
+    OWN_PIECE = 5
+    SAME_SPACE = 6
+    KNIGHT_MOVE = 7
+    KNIGHT_CAPTURE = 8
+    ROOK_MOVE = 9
+    ROOK_CAPTURE = 10
+    ROOK_BLOCKED = 11
+    PAWN_CAPTURE_ONLY_DIAGONALLY = 12
+    PAWN_JUMP = 13
+    PAWN_TWO_AFTER_FIRST_MOVE = 14
+    PAWN_CHANGE_FILE = 15
+    PAWN_TOO_FAR = 16
+    PAWN_SAME_SPACE = 17
+    PAWN_BACKWARD = 18
+    PAWN_CAPTURE = 19
+    KING_MOVE = 20
+    KING_CAPTURE = 21
+
+    @property
+    def message(self):
+        return REASON_MESSAGES[self]
+
+
+REASON_MESSAGES = {
+    Reason.LEGAL: "",
+    Reason.NOT_A_SPACE: "The target is not a Space.",
+    Reason.NOT_ON_BOARD: "That piece is not on the board.",
+    Reason.TARGET_OCCUPIED: "Target space not empty.",
+    Reason.NOTHING_TO_CAPTURE: "There is no piece to capture in the target space.",
+    Reason.OWN_PIECE: "Cannot capture pieces of a player's own color.",
+    Reason.SAME_SPACE: "A piece that moves must end on a different space.",
+    Reason.KNIGHT_MOVE: "A Knight must move two spaces straight and one space perpendicular.",
+    Reason.KNIGHT_CAPTURE: "A Knight must capture two spaces straight and one space perpendicular.",
+    Reason.ROOK_MOVE: "A rook must move entirely vertically or entirely horizontally.",
+    Reason.ROOK_CAPTURE: "A rook must capture entirely vertically or entirely horizontally.",
+    Reason.ROOK_BLOCKED: "A Rook cannot move over any other piece.",
+    Reason.PAWN_CAPTURE_ONLY_DIAGONALLY: "A Pawn may only capture diagonally.",
+    Reason.PAWN_JUMP: "A Pawn may not jump over any other pieces.",
+    Reason.PAWN_TWO_AFTER_FIRST_MOVE: "A Pawn may only move two Spaces on its first move.",
+    Reason.PAWN_CHANGE_FILE: "A Pawn may not move to a different file unless capturing.",
+    Reason.PAWN_TOO_FAR: "A Pawn may never move more than two Spaces at a time.",
+    Reason.PAWN_SAME_SPACE: "A Pawn must end up on a different Space from the one it started on when moving.",
+    Reason.PAWN_BACKWARD: "A Pawn may not move backward.",
+    Reason.PAWN_CAPTURE: "A Pawn may only capture one space ahead diagonally.",
+    Reason.KING_MOVE: "A King may only move one space in any direction.",
+    Reason.KING_CAPTURE: "A King may only capture one space away in any direction.",
+}
+
+
+def raise_for(reason):
+    """
+    Raises the exception for a move or capture that is not legal for the given Reason.
+    """
+
+    if reason is Reason.NOT_A_SPACE:
+        raise IllegalPlacementException(reason.message)
+    raise IllegalMoveException(reason.message)
+
+
+# Piece classes by piece type number, filled in as each piece class is defined.
+PIECE_CLASSES = {}
+
+
+def piece_from_code(code):
+    """
+    Creates a piece from its piece code (see Piece.code). The module defining the
+    piece class must already have been imported.
+    """
+    return PIECE_CLASSES[code & 7](PieceColor.BLACK if code >> 3 else PieceColor.WHITE)
+
+
 class Piece:
 
+    __slots__ = ("color", "side", "moved", "current_space")
+
+    # The piece type number from board.py used to index the Board's bitboards.
+    # Each piece class sets its own.
+    kind = 0
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        PIECE_CLASSES[cls.kind] = cls
+
     def __init__(self, color):
-        self.color = color
+        # Accept either a PieceColor or its value, e.g. Pawn(-1) for a black Pawn.
+        self.color = PieceColor(color)
+        self.side = WHITE if self.color is PieceColor.WHITE else BLACK
         self.moved = False
         self.current_space = None
 
-    def move(self, target):
+    @property
+    def code(self):
+        """
+        A number from 1 to 14 identifying the piece type and color: the piece type
+        number, plus 8 for a black piece. This leaves 0 free to mean an empty square.
+        """
+        return self.kind | (self.side << 3)
+
+    def move_rule(self, board, target):
+        """
+        Checks where this kind of piece may move, from its current Space to the target Space
+        on the given Board. Each piece class provides its own, returning Reason.LEGAL or the
+        Reason the move breaks its rule.
+        """
+        return Reason.LEGAL
+
+    def capture_rule(self, board, target):
+        """
+        Checks where this kind of piece may capture, in the same way as move_rule.
+        """
+        return Reason.LEGAL
+
+    def is_legal_move(self, board, target):
+        """
+        Checks whether moving onto the target Space is legal: the piece must be on the board,
+        the move must follow the piece's own rule, and the target must be an empty Space.
+        Returns Reason.LEGAL only when the move is legal.
+        """
 
         if not isinstance(target, Space):
-            raise IllegalPlacementException("The target is not a Space.")
+            return Reason.NOT_A_SPACE
+        if not self.current_space:
+            return Reason.NOT_ON_BOARD
+        reason = self.move_rule(board, target)
+        if reason is not Reason.LEGAL:
+            return reason
+        if target.current_piece:
+            return Reason.TARGET_OCCUPIED
+        return Reason.LEGAL
 
-        if self.current_space and not target.current_piece:
-            self.current_space = target
-            target.current_piece = self
-            self.moved = True
-        else:
-            raise IllegalMoveException("Target space not empty.")
-
-    def capture(self, target):
-        if self.current_space and target.current_piece and (self.color != target.current_piece.color):
-            target.current_piece.remove()
-            target.current_piece = self
-            self.current_space = target
-            self.moved = True
-        else:
-            if not self.current_space:
-                raise IllegalMoveException("That piece is not on the board.")
-            elif not target.current_piece:
-                raise IllegalMoveException("There is no piece to capture in the target space.")
-            elif self.color == target.current_piece.color:
-                raise IllegalMoveException("Cannot capture pieces of a player's own color.")
+    def is_legal_capture(self, board, target):
+        """
+        Checks whether capturing on the target Space is legal: the piece must be on the board,
+        the capture must follow the piece's own rule, and the target must hold a piece of the
+        other color.
+        """
+
+        if not isinstance(target, Space):
+            return Reason.NOT_A_SPACE
+        if not self.current_space:
+            return Reason.NOT_ON_BOARD
+        reason = self.capture_rule(board, target)
+        if reason is not Reason.LEGAL:
+            return reason
+        victim = target.current_piece
+        if not victim:
+            return Reason.NOTHING_TO_CAPTURE
+        if victim.color == self.color:
+            return Reason.OWN_PIECE
+        return Reason.LEGAL
+
+    def move(self, target, board=None):
+        """
+        Moves onto the target Space, checking the move on the given Board, or on the target's
+        own Board if none is given. Raises IllegalMoveException if the move is not legal.
+        """
+
+        if board is None:
+            board = getattr(target, "board", None)
+        reason = self.is_legal_move(board, target)
+        if reason is not Reason.LEGAL:
+            raise_for(reason)
+        self._relocate(target)
+
+    def capture(self, target, board=None):
+        """
+        Captures on the target Space, in the same way as move.
+        """
+
+        if board is None:
+            board = getattr(target, "board", None)
+        reason = self.is_legal_capture(board, target)
+        if reason is not Reason.LEGAL:
+            raise_for(reason)
+        target.current_piece.remove()
+        self._relocate(target)
+
+    def _relocate(self, target):
+        # Moves onto the target Space once the move or capture has been checked.
+        self.current_space.current_piece = None
+        self.current_space = target
+        target.current_piece = self
+        self.moved = True
 
     def place(self, target):
 
@@ -87,3 +262,48 @@ class Piece:
             self.current_space = None
         else:
             raise IllegalMoveException("That piece is not on the board.")
+
+    def attacks_from(self, index, occupied):
+        """
+        Gets the bitboard of squares this piece would attack from the given square, with the
+        given squares occupied. Each piece class provides its own.
+        """
+        return 0
+
+    def attacks(self, board):
+        """
+        Gets the bitboard of squares this piece attacks from its current Space, as kept
+        up to date by the Board.
+        """
+        return board.square_attacks[self.current_space.index]
+
+    def move_bitboard(self, board):
+        """
+        Gets the bitboard of empty squares this piece can move to.
+        """
+        return self.attacks(board) & ~board.occupied
+
+    def capture_bitboard(self, board):
+        """
+        Gets the bitboard of squares holding pieces this piece can capture.
+        """
+        return self.attacks(board) & board.color_occupancy[1 - self.side]
+
+    def targets(self, board):
+        """
+        Gets every Space this piece can move to or capture on.
+        """
+
+        reachable = self.move_bitboard(board) | self.capture_bitboard(board)
+        return [board.space_at(index) for index in iter_squares(reachable)]
+
+    def generate_moves(self, board, moves):
+        """
+        Adds every move and capture this piece can make to a list of encoded moves (see move.py).
+        """
+
+        origin = self.current_space.index
+        for target in iter_squares(self.move_bitboard(board)):
+            moves.append(encode_move(origin, target))
+        for target in iter_squares(self.capture_bitboard(board)):
+            moves.append(encode_move(origin, target, CAPTURE))
@@ -0,0 +1,209 @@
+"""
+Positions
+Sets up Boards from lists of pieces or from files of FEN or
+EPD positions, and converts a Board to and from a fixed-size
+binary record, so that positions can be sent between processes
+or stored without the Board's Space and Piece objects.
+
+A record is 32 bytes, all little-endian:
+    bytes 0-7    the occupancy bitboard
+    bytes 8-23   the piece code (see Piece.code) of each occupied
+                 square, in square order, two to a byte with the
+                 first in the low four bits
+    bytes 24-31  the bitboard of pieces that have moved
+This leaves room for the 32 pieces of a game.
+
+PositionStore appends records to a file and reads them back
+through a memory map, either one Board at a time or all at once
+as a NumPy array that views the file without copying it.
+"""
+
+import mmap
+import os
+
+from board import Board, SQUARE_NAMES, WHITE, BLACK, iter_squares
+from piece import PieceColor, piece_from_code
+
+# Importing the piece classes registers them for piece_from_code.
+from pawn import Pawn
+from knight import Knight
+from rook import Rook
+from king import King
+
+# Piece classes by their letter in algebraic notation.
+PIECE_LETTERS = {"P": Pawn, "N": Knight, "R": Rook, "K": King}
+
+# The opening position with only pawns, knights, and rooks. The Kings are left out too, so that
+# every move the pieces generate is legal and perft counts stay comparable from one change to the next.
+STANDARD_WHITE = "Ra1 Nb1 Ng1 Rh1 Pa2 Pb2 Pc2 Pd2 Pe2 Pf2 Pg2 Ph2"
+STANDARD_BLACK = "Ra8 Nb8 Ng8 Rh8 Pa7 Pb7 Pc7 Pd7 Pe7 Pf7 Pg7 Ph7"
+
+# The same position with the Kings, for playing and replaying games.
+OPENING_WHITE = STANDARD_WHITE + " Ke1"
+OPENING_BLACK = STANDARD_BLACK + " Ke8"
+
+RECORD_SIZE = 32
+MAX_PIECES = 32
+
+
+def setup_board(white, black):
+    """
+    Sets up a Board from lists of pieces written as a piece letter and a Space name, e.g. "Nb1 Pe2".
+    """
+
+    board = Board()
+    for color, pieces in ((PieceColor.WHITE, white), (PieceColor.BLACK, black)):
+        for piece in pieces.split():
+            PIECE_LETTERS[piece[0]](color).place(board.space_at(SQUARE_NAMES[piece[1:]]))
+    return board
+
+
+def standard_board():
+    return setup_board(STANDARD_WHITE, STANDARD_BLACK)
+
+
+def opening_board():
+    return setup_board(OPENING_WHITE, OPENING_BLACK)
+
+
+def encode(board):
+    """
+    Gets the 32-byte record of a Board's position. Raises ValueError if there are
+    more pieces on the Board than a record has room for.
+    """
+
+    occupied = board.occupied
+    if occupied.bit_count() > MAX_PIECES:
+        raise ValueError("A position record holds at most 32 pieces.")
+
+    codes = bytearray(16)
+    moved = 0
+    squares = board.squares
+    for number, index in enumerate(iter_squares(occupied)):
+        piece = squares[index]
+        codes[number >> 1] |= piece.code << (4 * (number & 1))
+        if piece.moved:
+            moved |= 1 << index
+    return occupied.to_bytes(8, "little") + bytes(codes) + moved.to_bytes(8, "little")
+
+
+def decode(data):
+    """
+    Sets up a new Board from a 32-byte position record.
+    """
+
+    occupied = int.from_bytes(data[0:8], "little")
+    codes = data[8:24]
+    moved = int.from_bytes(data[24:32], "little")
+
+    board = Board()
+    for number, index in enumerate(iter_squares(occupied)):
+        piece = piece_from_code((codes[number >> 1] >> (4 * (number & 1))) & 15)
+        piece.moved = bool(moved & (1 << index))
+        piece.current_space = board.space_at(index)
+        board.set_piece(index, piece)
+    return board
+
+
+class PositionStore:
+    """
+    A file of position records. Records are appended to the end of the file and read back
+    through a memory map, which is refreshed when the file has grown.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "a+b")
+        self._map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        self._file.flush()
+        return os.path.getsize(self.path) // RECORD_SIZE
+
+    def __getitem__(self, number):
+        if not -len(self) <= number < len(self):
+            raise IndexError("No position record " + str(number) + ".")
+        start = (number % len(self)) * RECORD_SIZE
+        return decode(self._mapping()[start:start + RECORD_SIZE])
+
+    def append(self, board):
+        self._file.write(encode(board))
+
+    def extend(self, boards):
+        for board in boards:
+            self.append(board)
+
+    def _mapping(self):
+        size = len(self) * RECORD_SIZE
+        if self._map is None or len(self._map) != size:
+            # Views of an older map keep it open until they are released.
+            self._map = mmap.mmap(self._file.fileno(), size, access=mmap.ACCESS_READ) if size else b""
+        return self._map
+
+    def records(self):
+        """
+        Gets every record as a NumPy structured array (see RECORD_DTYPE) that views the memory
+        map directly. Requires NumPy.
+        """
+
+        import numpy as np
+
+        return np.frombuffer(self._mapping(), dtype=record_dtype())
+
+    def close(self):
+        self._map = None
+        self._file.close()
+
+
+def record_dtype():
+    """
+    Gets the NumPy dtype of a position record. Requires NumPy.
+    """
+
+    import numpy as np
+
+    return np.dtype([("occupied", "<u8"), ("codes", "u1", (16,)), ("moved", "<u8")])
+
+
+def read_positions(lines):
+    """
+    Yields (Board, color to move, operations) for each position in an iterable of lines in
+    FEN or EPD (Extended Position Description) format, such as an open file. The operations
+    are a dictionary of the EPD operations after the position, e.g. {"bm": "Nf3", "id": "test 1"},
+    and are empty for FEN. Blank lines and lines starting with # are skipped.
+    """
+
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+
+        fields = line.split(None, 4)
+        board = Board.from_fen(line)
+        side = BLACK if len(fields) > 1 and fields[1] == "b" else WHITE
+
+        operations = {}
+        # EPD has four position fields followed by operations; FEN ends with two move counters.
+        rest = fields[4] if len(fields) > 4 else ""
+        if rest and not rest.replace(" ", "").isdigit():
+            for operation in rest.split(";"):
+                operation = operation.strip()
+                if operation:
+                    opcode, _, operand = operation.partition(" ")
+                    operations[opcode] = operand.strip().strip('"')
+        yield board, side, operations
+
+
+def load_positions(path):
+    """
+    Yields (Board, color to move, operations) for each position in a FEN or EPD file.
+    """
+
+    with open(path, encoding="utf-8") as position_file:
+        yield from read_positions(position_file)
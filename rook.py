@@ -1,70 +1,48 @@
 from piece import *
 from board import *
+from attacks import BETWEEN, ROOK_RAYS, rook_attacks
 
 
 class Rook(Piece):
 
+    __slots__ = ()
+    kind = ROOK
+
     def __init__(self, color):
         super().__init__(color)
 
-    def move(self, board, target):
-
-        if target.file == self.current_space.file or target.rank == self.current_space.rank:
-            if target.file == self.current_space.file and target.rank == self.current_space.rank:
-                raise IllegalMoveException("A piece that moves must end on a different space.")
-            else:
-                # Determine whether move is horizontal or vertical.
-                if target.file != self.current_space.file:
+    def move_rule(self, board, target):
+        """
+        A rook moves any number of spaces along its rank or its file, and may
+        not pass over or land on any other piece when moving.
+        """
 
-                    # Horizontal move
-                    distance = ord(target.file) - ord(self.current_space.file)
+        current = self.current_space.index
 
-                    traveled = 0
-                    legal_move = True
+        if target.index == current:
+            return Reason.SAME_SPACE
+        if not ROOK_RAYS[current] & target.bit:
+            return Reason.ROOK_MOVE
+        if (BETWEEN[current][target.index] | target.bit) & board.occupied:
+            return Reason.ROOK_BLOCKED
+        return Reason.LEGAL
 
-                    while traveled < abs(distance) and legal_move:
-                        # Moving in toward the H-file
-                        if distance > 0:
-                            target_file = chr(ord(self.current_space.file) + traveled + 1)
-                        # Moving toward the A-file
-                        elif distance < 0:
-                            target_file = chr(ord(self.current_space.file) - traveled - 1)
-                        target_space = board.get_space(target_file, self.current_space.rank)
-                        if target_space.current_piece:
-                            legal_move = False
-                        else:
-                            traveled += 1
-                    if legal_move:
-                        super().move(target)
-                    else:
-                        raise IllegalMoveException("A Rook cannot move over any other piece.")
+    def capture_rule(self, board, target):
+        """
+        A rook captures along its rank or its file in the same way as it moves,
+        and may not pass over any other piece on the way.
+        """
 
-                elif target.rank != self.current_space.rank:
+        current = self.current_space.index
 
-                    # Vertical move
-                    distance = target.rank - self.current_space.rank
-                    traveled = 0
+        if not ROOK_RAYS[current] & target.bit:
+            return Reason.ROOK_CAPTURE
+        if BETWEEN[current][target.index] & board.occupied:
+            return Reason.ROOK_BLOCKED
+        return Reason.LEGAL
 
-                    legal_move = True
-
-                    while traveled < abs(distance) and legal_move:
-                        if distance > 0:
-                            # Moving toward rank 8
-                            target_rank = self.current_space.rank + traveled + 1
+    def move(self, board, target):
+        super().move(target, board)
 
-                            # Moving toward rank 1
-                        elif distance < 0:
-                            target_rank = self.current_space.rank - traveled - 1
-                        target_space = board.get_space(self.current_space.file, target_rank)
-                        if target_space.current_piece:
-                            legal_move = False
-                        else:
-                            traveled += 1
-                    if legal_move:
-                        super().move(target)
-                    else:
-                        raise IllegalMoveException("A Rook cannot move over any other piece.")
-                else:
-                    raise IllegalMoveException("A rook must move entirely vertically or entirely horizontally.")
-        else:
-            raise IllegalMoveException("A rook must move entirely vertically or entirely horizontally.")
+    def attacks_from(self, index, occupied):
+        return rook_attacks(index, occupied)
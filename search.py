@@ -0,0 +1,288 @@
+"""
+Search
+Finds the best move for a player by searching ahead through
+the moves both players can make, using negamax alpha-beta:
+each position's score is the best of its moves' scores from
+the point of view of the player to move, and any move that
+cannot change the result is cut off without being searched.
+
+The search deepens one ply at a time (iterative deepening), so
+that a result is ready as soon as the first ply is searched,
+and each deeper search starts with the best move of the last.
+Within each position, moves are tried in the order given by
+ordering.py, starting with the best move found there before.
+At the end of each line, captures are searched until the
+position is quiet (quiescence search), so that a line is not
+scored in the middle of an exchange. Positions are scored with
+evaluate.py.
+
+A search can be given a budget of nodes (positions visited)
+and of seconds, and stops as soon as either is spent, keeping
+the result of the deepest search it finished. The moves come
+from the Board's legal move generation, so the piece classes'
+own rules decide what can be played.
+
+Usage: python search.py [seconds] [position name]
+"""
+
+import sys
+import time
+
+from board import BLACK, BLACK_TO_MOVE_KEY, side_of
+from evaluate import evaluate
+from move import CAPTURE, move_name
+from ordering import MoveOrdering, mvv_lva, pick
+from transposition import TranspositionTable
+
+# The score of giving checkmate. A checkmate found nearer the root scores higher, so that the
+# quickest one is chosen; any score above MATE_BOUND is a forced checkmate.
+MATE = 100000
+MATE_BOUND = MATE - 1000
+INFINITY = MATE + 1
+
+MAX_DEPTH = 64
+
+# What a stored score means: the exact score, or only a bound on it because of a cutoff.
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+# How many nodes to visit between looking at the clock.
+CLOCK_INTERVAL = 256
+
+
+class SearchResult:
+    """
+    The outcome of a search: the best move found and its score, the deepest search finished,
+    how many nodes were visited and how long it took, and whether a budget cut it short.
+    """
+
+    def __init__(self):
+        self.best_move = None
+        self.score = 0
+        self.depth = 0
+        self.nodes = 0
+        self.elapsed = 0.0
+        self.stopped = False
+
+    def per_second(self):
+        return self.nodes / self.elapsed if self.elapsed else 0.0
+
+
+class Searcher:
+    """
+    Searches positions within node and time budgets, keeping a transposition table of results
+    and the move ordering tables from one search to the next.
+    """
+
+    def __init__(self, table=None, node_limit=None, time_limit=None, ordering=None):
+        self.table = TranspositionTable() if table is None else table
+        self.ordering = MoveOrdering() if ordering is None else ordering
+        self.node_limit = node_limit
+        self.time_limit = time_limit
+
+        self.nodes = 0
+        self.deadline = None
+        self.stopped = False
+
+    def search(self, board, color, depth=MAX_DEPTH):
+        """
+        Searches for the given player's best move, deepening one ply at a time up to the given
+        depth or until a budget is spent. Returns a SearchResult.
+        """
+
+        side = side_of(color)
+        result = SearchResult()
+        start = time.perf_counter()
+
+        self.nodes = 0
+        self.stopped = False
+        self.deadline = start + self.time_limit if self.time_limit is not None else None
+
+        # Killer moves belong to the last search's positions; history still says something here.
+        for index in range(len(self.ordering.killers)):
+            self.ordering.killers[index] = 0
+        self.ordering.age()
+
+        moves = board.legal_moves(side)
+        if moves:
+            result.best_move = moves[0]
+
+        for current_depth in range(1, depth + 1):
+            if not moves:
+                break
+
+            best_move, score = self._root(board, side, current_depth, moves)
+            if self.stopped:
+                break
+
+            result.best_move = best_move
+            result.score = score
+            result.depth = current_depth
+
+            # Search the best move first next time; it is the most likely to stay best.
+            moves.remove(best_move)
+            moves.insert(0, best_move)
+
+            if abs(score) > MATE_BOUND:
+                break
+
+        result.nodes = self.nodes
+        result.elapsed = time.perf_counter() - start
+        result.stopped = self.stopped
+        return result
+
+    def _root(self, board, side, depth, moves):
+        alpha = -INFINITY
+        best_move = moves[0]
+        for move in moves:
+            board.make_move(move)
+            score = -self._negamax(board, 1 - side, depth - 1, 1, -INFINITY, -alpha)
+            board.unmake_move()
+            if self.stopped:
+                break
+            if score > alpha:
+                alpha = score
+                best_move = move
+        return best_move, alpha
+
+    def _out_of_budget(self):
+        if self.node_limit is not None and self.nodes >= self.node_limit:
+            self.stopped = True
+        elif self.deadline is not None and self.nodes % CLOCK_INTERVAL == 0 and \
+                time.perf_counter() >= self.deadline:
+            self.stopped = True
+        return self.stopped
+
+    def _negamax(self, board, side, depth, ply, alpha, beta):
+        """
+        Scores a position for the player to move, searching depth plies ahead. The score is
+        exact when it falls between alpha and beta, and is otherwise only a bound.
+        """
+
+        if depth <= 0:
+            return self._quiescence(board, side, ply, alpha, beta)
+
+        self.nodes += 1
+        if self._out_of_budget():
+            return 0
+
+        key = board.hash_key ^ (BLACK_TO_MOVE_KEY if side == BLACK else 0)
+        # A shallower result cannot stand in for this search, but its best move is still worth trying first.
+        entry = self.table.probe(key)
+        hash_move = None
+        if entry is not None:
+            stored_score, bound, hash_move, stored_depth = entry
+            stored_score = _score_from_table(stored_score, ply)
+            if stored_depth >= depth and (bound == EXACT or (bound == LOWER and stored_score >= beta) or
+                                          (bound == UPPER and stored_score <= alpha)):
+                return stored_score
+
+        moves = board.legal_moves(side)
+        if not moves:
+            return -MATE + ply if board.in_check(side) else 0
+
+        scores = self.ordering.score(board, moves, hash_move, ply)
+
+        original_alpha = alpha
+        best_score = -INFINITY
+        best_move = moves[0]
+        for index in range(len(moves)):
+            pick(moves, scores, index)
+            move = moves[index]
+            board.make_move(move)
+            score = -self._negamax(board, 1 - side, depth - 1, ply + 1, -beta, -alpha)
+            board.unmake_move()
+            if self.stopped:
+                return 0
+
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        self.ordering.record_cutoff(move, depth, ply)
+                        break
+
+        if best_score >= beta:
+            bound = LOWER
+        elif best_score > original_alpha:
+            bound = EXACT
+        else:
+            bound = UPPER
+        self.table.store(key, depth, (_score_to_table(best_score, ply), bound, best_move, depth))
+        return best_score
+
+    def _quiescence(self, board, side, ply, alpha, beta):
+        """
+        Scores a position by searching only captures, until there are none worth making. The
+        player to move may also decline to capture and keep the position's own score.
+        """
+
+        self.nodes += 1
+        if self._out_of_budget():
+            return 0
+
+        standing = evaluate(board, side)
+        if standing >= beta:
+            return standing
+        if standing > alpha:
+            alpha = standing
+
+        captures = [move for move in board.legal_moves(side) if move >> 12 & CAPTURE]
+        scores = [mvv_lva(board, move) for move in captures]
+        for index in range(len(captures)):
+            pick(captures, scores, index)
+            move = captures[index]
+            board.make_move(move)
+            score = -self._quiescence(board, 1 - side, ply + 1, -beta, -alpha)
+            board.unmake_move()
+            if self.stopped:
+                return 0
+
+            if score > alpha:
+                alpha = score
+                if alpha >= beta:
+                    break
+        return alpha
+
+
+def _score_to_table(score, ply):
+    # Checkmate scores count plies from the root; store them counting from this position instead,
+    # so they still hold when the position is reached at another ply.
+    if score > MATE_BOUND:
+        return score + ply
+    if score < -MATE_BOUND:
+        return score - ply
+    return score
+
+
+def _score_from_table(score, ply):
+    if score > MATE_BOUND:
+        return score - ply
+    if score < -MATE_BOUND:
+        return score + ply
+    return score
+
+
+def search(board, color, depth=MAX_DEPTH, nodes=None, seconds=None, table=None):
+    """
+    Searches for the given player's best move within the given budgets of nodes and seconds.
+    Returns a SearchResult.
+    """
+    return Searcher(table, nodes, seconds).search(board, color, depth)
+
+
+if __name__ == "__main__":
+    from perft import REFERENCE_POSITIONS
+    from position import setup_board
+
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    names = [" ".join(sys.argv[2:])] if len(sys.argv) > 2 else list(REFERENCE_POSITIONS)
+    for name in names:
+        white, black, color, expected = REFERENCE_POSITIONS[name]
+        result = search(setup_board(white, black), color, seconds=seconds)
+        print("{:<16} {}  score {:>6}  depth {:>2}  {:>8} nodes  {:8.3f} s  {:>8.0f} nodes/s".format(
+            name, move_name(result.best_move), result.score, result.depth, result.nodes, result.elapsed,
+            result.per_second()))
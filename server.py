@@ -0,0 +1,352 @@
+"""
+Game server
+Holds many games in memory and plays the moves submitted for
+them over a simple line protocol, on a TCP or Unix socket.
+
+Each request is one line of words, and is answered with one
+line starting with OK, ILLEGAL, BUSY, or ERROR:
+    NEW [fen]                 starts a game, from the opening position
+                              unless a FEN is given; answers OK <game>
+    MOVE <game> <move>        plays a move in coordinate notation, e.g.
+                              e2e4; answers OK <fen> or ILLEGAL <reason>
+    MOVES <game>              answers OK and the legal moves
+    FEN <game>                answers OK <fen>
+    ANALYSE <game> [seconds]  searches for the best move; answers
+                              OK <move> <score> <depth> <nodes>
+    CLOSE <game>              ends a game
+    STATS                     answers OK and the latency of each command
+    QUIT                      closes the connection
+
+Moves are checked against the legal moves of the game, which
+come from the piece classes' own rules, and an illegal move is
+answered with the piece's Reason for rejecting it. Requests for
+one game are handled one at a time, each holding that game's
+lock; requests for different games do not wait for each other.
+
+Analysis is the only request that takes real time, so it is
+sent, as an encoded position (see position.py), to a pool of
+worker processes and the event loop carries on meanwhile. At
+most max_pending analyses may be waiting at once; beyond that
+ANALYSE is answered BUSY straight away rather than queued. Each
+connection's requests are read one at a time, and the next one
+is not read until the answer to the last has been sent, so a
+client that sends faster than it reads is slowed down by the
+socket rather than buffered without limit.
+
+Usage: python server.py [port]
+"""
+
+import asyncio
+import bisect
+import math
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import position
+import search
+from board import SQUARE_NAMES
+from game import Game
+from move import move_name
+from piece import Reason
+
+# The longest analysis a request may ask for, in seconds, and the most nodes any analysis may
+# search, so that a worker is always freed even if its clock cannot be trusted.
+MAX_ANALYSIS_SECONDS = 10.0
+DEFAULT_ANALYSIS_SECONDS = 1.0
+MAX_ANALYSIS_NODES = 10000000
+
+# The longest request line accepted, in bytes.
+MAX_LINE = 4096
+
+
+class LatencyHistogram:
+    """
+    Counts how long requests took, in buckets whose upper bounds double from 50 microseconds.
+    """
+
+    BOUNDS = tuple(0.00005 * 2 ** step for step in range(22))
+
+    def __init__(self):
+        # One count per bound, and a last one for anything slower.
+        self.counts = [0] * (len(self.BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def record(self, seconds):
+        self.counts[bisect.bisect_left(self.BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.maximum = max(self.maximum, seconds)
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, fraction):
+        """
+        Gets the upper bound of the bucket holding the given fraction (e.g. 0.99) of requests,
+        or the slowest request if it falls past the last bucket.
+        """
+
+        if not self.count:
+            return 0.0
+        wanted = fraction * self.count
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= wanted:
+                return self.BOUNDS[bucket] if bucket < len(self.BOUNDS) else self.maximum
+        return self.maximum
+
+
+class GameEntry:
+    """
+    A game held by the server, with the lock that its requests take turns holding.
+    """
+
+    def __init__(self, game):
+        self.game = game
+        self.lock = asyncio.Lock()
+
+
+def analyse(record, side, seconds, nodes=MAX_ANALYSIS_NODES):
+    """
+    Searches an encoded position in a worker process, within the given budgets. Returns the
+    best move, score, depth, and nodes searched.
+    """
+
+    result = search.search(position.decode(record), side, nodes=nodes, seconds=seconds)
+    return result.best_move, result.score, result.depth, result.nodes
+
+
+def illegal_reason(game, origin, target):
+    """
+    Explains why moving from one square to another is not legal, using the piece's own rules.
+    """
+
+    board = game.board
+    piece = board.squares[origin]
+    if piece is None:
+        return "There is no piece on that space."
+    if piece.side != game.side:
+        return "That piece belongs to the other player."
+
+    space = board.space_at(target)
+    if space.current_piece is not None and space.current_piece is not piece:
+        reason = piece.is_legal_capture(board, space)
+    else:
+        reason = piece.is_legal_move(board, space)
+    if reason is not Reason.LEGAL:
+        return reason.message
+    return "That move would leave the King in check."
+
+
+class GameServer:
+
+    def __init__(self, executor=None, workers=None, max_pending=64, max_games=100000):
+        self.games = {}
+        self.next_game = 1
+        self.max_games = max_games
+
+        self.executor = ProcessPoolExecutor(max_workers=workers) if executor is None else executor
+        self.max_pending = max_pending
+        self.pending = 0
+
+        self.latency = {}
+        self.servers = []
+
+        self.commands = {"NEW": self._new, "MOVE": self._move, "MOVES": self._moves, "FEN": self._fen,
+                         "ANALYSE": self._analyse, "CLOSE": self._close, "STATS": self._stats}
+
+    async def handle(self, line):
+        """
+        Answers one request line.
+        """
+
+        start = time.perf_counter()
+        words = line.split()
+        command = words[0].upper() if words else ""
+        handler = self.commands.get(command)
+        if handler is None:
+            return "ERROR Unknown command."
+
+        try:
+            answer = await handler(words[1:])
+        except IndexError:
+            answer = "ERROR Missing argument."
+        except ValueError as error:
+            answer = "ERROR " + str(error)
+
+        self.latency.setdefault(command, LatencyHistogram()).record(time.perf_counter() - start)
+        return answer
+
+    def _entry(self, words):
+        entry = self.games.get(words[0])
+        if entry is None:
+            raise ValueError("No game " + words[0] + ".")
+        return entry
+
+    async def _new(self, words):
+        if len(self.games) >= self.max_games:
+            return "BUSY Too many games."
+        game = Game.from_fen(" ".join(words)) if words else Game()
+        game_id = str(self.next_game)
+        self.next_game += 1
+        self.games[game_id] = GameEntry(game)
+        return "OK " + game_id
+
+    async def _move(self, words):
+        entry = self._entry(words)
+        name = words[1].lower()
+        origin = SQUARE_NAMES.get(name[:2])
+        target = SQUARE_NAMES.get(name[2:4])
+        if origin is None or target is None or len(name) != 4:
+            raise ValueError("Moves are written as two squares, e.g. e2e4.")
+
+        async with entry.lock:
+            game = entry.game
+            for move in game.legal_moves():
+                if move_name(move) == name:
+                    game.play(move)
+                    return "OK " + game.to_fen()
+            return "ILLEGAL " + illegal_reason(game, origin, target)
+
+    async def _moves(self, words):
+        entry = self._entry(words)
+        async with entry.lock:
+            return " ".join(["OK"] + sorted(move_name(move) for move in entry.game.legal_moves()))
+
+    async def _fen(self, words):
+        entry = self._entry(words)
+        async with entry.lock:
+            return "OK " + entry.game.to_fen()
+
+    async def _analyse(self, words):
+        entry = self._entry(words)
+        seconds = float(words[1]) if len(words) > 1 else DEFAULT_ANALYSIS_SECONDS
+        if not (math.isfinite(seconds) and seconds > 0):
+            raise ValueError("The analysis time must be a positive number of seconds.")
+        seconds = min(seconds, MAX_ANALYSIS_SECONDS)
+        if self.pending >= self.max_pending:
+            return "BUSY Too many analyses waiting."
+
+        # Only taking the snapshot holds the lock; moves can be played while the analysis runs.
+        async with entry.lock:
+            record = position.encode(entry.game.board)
+            side = entry.game.side
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            move, score, depth, nodes = await loop.run_in_executor(self.executor, analyse, record, side, seconds)
+        finally:
+            self.pending -= 1
+        return "OK {} {} {} {}".format(move_name(move) if move is not None else "-", score, depth, nodes)
+
+    async def _close(self, words):
+        entry = self._entry(words)
+        async with entry.lock:
+            del self.games[words[0]]
+        return "OK"
+
+    async def _stats(self, words):
+        parts = ["OK", "games=" + str(len(self.games)), "pending=" + str(self.pending)]
+        for command, histogram in sorted(self.latency.items()):
+            parts.append("{}:n={},mean={:.3f}ms,p50={:.3f}ms,p99={:.3f}ms,max={:.3f}ms".format(
+                command, histogram.count, 1000 * histogram.mean(), 1000 * histogram.percentile(0.5),
+                1000 * histogram.percentile(0.99), 1000 * histogram.maximum))
+        return " ".join(parts)
+
+    async def handle_connection(self, reader, writer):
+        """
+        Answers each request line from one connection in turn, until it sends QUIT or closes.
+        """
+
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    writer.write(b"ERROR Line too long.\n")
+                    break
+                if not line:
+                    break
+                text = line.decode("utf-8", errors="replace").strip()
+                if text.upper() == "QUIT":
+                    break
+                if not text:
+                    continue
+                writer.write((await self.handle(text)).encode("utf-8") + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host="127.0.0.1", port=0):
+        """
+        Starts listening on a TCP port (0 for any free port). Returns the asyncio Server.
+        """
+
+        server = await asyncio.start_server(self.handle_connection, host, port, limit=MAX_LINE)
+        self.servers.append(server)
+        return server
+
+    async def start_unix(self, path):
+        """
+        Starts listening on a Unix socket. Returns the asyncio Server.
+        """
+
+        server = await asyncio.start_unix_server(self.handle_connection, path, limit=MAX_LINE)
+        self.servers.append(server)
+        return server
+
+    async def close(self):
+        for server in self.servers:
+            server.close()
+            await server.wait_closed()
+        self.servers = []
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class Client:
+    """
+    A connection to a GameServer, sending one request at a time and waiting for its answer.
+    """
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, host="127.0.0.1", port=None, path=None):
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def request(self, line):
+        self.writer.write(line.encode("utf-8") + b"\n")
+        await self.writer.drain()
+        return (await self.reader.readline()).decode("utf-8").rstrip("\n")
+
+    async def close(self):
+        self.writer.write(b"QUIT\n")
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def _main(port):
+    game_server = GameServer()
+    server = await game_server.start(port=port)
+    print("Listening on", ", ".join(str(sock.getsockname()) for sock in server.sockets))
+    try:
+        await server.serve_forever()
+    finally:
+        await game_server.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main(int(sys.argv[1]) if len(sys.argv) > 1 else 7878))
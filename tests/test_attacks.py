@@ -0,0 +1,57 @@
+"""
+Tests for the precomputed attack tables, comparing
+them against squares found by walking the board
+one step at a time.
+"""
+
+import sys
+import pytest
+import random
+sys.path.append("..")
+from board import *
+from attacks import *
+
+
+def walk(index, occupied, directions):
+    attacks = 0
+    for file_step, rank_step in directions:
+        file_number = index % 8 + file_step
+        rank_number = index // 8 + rank_step
+        while 0 <= file_number < 8 and 0 <= rank_number < 8:
+            attacks |= 1 << (rank_number * 8 + file_number)
+            if occupied & (1 << (rank_number * 8 + file_number)):
+                break
+            file_number += file_step
+            rank_number += rank_step
+    return attacks
+
+
+class TestKnightAttacks:
+
+    def test_corner_and_center(self):
+        assert sorted(iter_squares(KNIGHT_ATTACKS[square_index("a", 1)])) == \
+            sorted([square_index("b", 3), square_index("c", 2)])
+        assert bin(KNIGHT_ATTACKS[square_index("d", 4)]).count("1") == 8
+
+
+class TestSlidingAttacks:
+
+    def test_rook_attacks_match_walk(self):
+        generator = random.Random(1)
+        for trial in range(500):
+            occupied = generator.getrandbits(64) & generator.getrandbits(64)
+            index = generator.randrange(64)
+            assert rook_attacks(index, occupied) == walk(index, occupied, ROOK_DIRECTIONS)
+            assert bishop_attacks(index, occupied) == walk(index, occupied, BISHOP_DIRECTIONS)
+
+    def test_empty_board_rays(self):
+        assert ROOK_RAYS[square_index("a", 1)] == RAYS[NORTH][0] | RAYS[EAST][0]
+        assert bin(ROOK_RAYS[square_index("d", 4)]).count("1") == 14
+        assert bin(BISHOP_RAYS[square_index("d", 4)]).count("1") == 13
+
+    def test_between(self):
+        a1 = square_index("a", 1)
+        a8 = square_index("a", 8)
+        assert sorted(iter_squares(BETWEEN[a1][a8])) == list(range(8, 56, 8))
+        assert BETWEEN[a1][square_index("b", 3)] == 0
+        assert BETWEEN[a1][square_index("c", 3)] == 1 << square_index("b", 2)
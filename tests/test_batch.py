@@ -0,0 +1,70 @@
+"""
+Tests for batch move validation, comparing its
+answers against the moves the Board generates
+from the piece classes' own rules.
+"""
+
+import sys
+import pytest
+import random
+sys.path.append("..")
+np = pytest.importorskip("numpy")
+from board import Board, WHITE, BLACK, SQUARE_NAMES
+from move import move_origin, move_target
+from perft import REFERENCE_POSITIONS, setup_board
+from pawn import Pawn
+from rook import Rook
+from piece import PieceColor
+import batch
+
+
+@pytest.fixture
+def test_boards():
+    boards = [setup_board(white, black) for white, black, color, expected in REFERENCE_POSITIONS.values()]
+
+    # Play a few random moves on each to get a mix of moved and unmoved pieces.
+    generator = random.Random(12)
+    for board in boards:
+        for ply in range(6):
+            moves = board.generate_moves(ply % 2)
+            if moves:
+                board.make_move(generator.choice(moves))
+    return boards
+
+
+class TestBatchValidation:
+
+    def test_matches_generated_moves(self, test_boards):
+        pieces, moved = batch.encode_boards(test_boards)
+
+        board_ids = []
+        origins = []
+        targets = []
+        expected = []
+        for board_id, board in enumerate(test_boards):
+            legal = set()
+            for side in (WHITE, BLACK):
+                legal.update((move_origin(move), move_target(move)) for move in board.generate_moves(side))
+            for origin in range(64):
+                for target in range(64):
+                    board_ids.append(board_id)
+                    origins.append(origin)
+                    targets.append(target)
+                    expected.append((origin, target) in legal)
+
+        assert list(batch.is_legal(pieces, moved, board_ids, origins, targets)) == expected
+
+    def test_reasons(self):
+        test_board = Board()
+        Rook(PieceColor.WHITE).place(test_board.get_space("a", 1))
+        Pawn(PieceColor.WHITE).place(test_board.get_space("a", 2))
+        Pawn(PieceColor.BLACK).place(test_board.get_space("a", 3))
+        pieces, moved = batch.encode_boards([test_board])
+
+        moves = [("a1", "a1"), ("a1", "a2"), ("a1", "b2"), ("a1", "a4"), ("a2", "a3"), ("c3", "c4"), ("a1", "h1")]
+        reasons = batch.validate(pieces, moved, [0] * len(moves),
+                                 [SQUARE_NAMES[origin] for origin, target in moves],
+                                 [SQUARE_NAMES[target] for origin, target in moves])
+
+        assert list(reasons) == [batch.SAME_SPACE, batch.OWN_PIECE, batch.ILLEGAL_PATTERN, batch.BLOCKED,
+                                 batch.BLOCKED, batch.NO_PIECE, batch.LEGAL]
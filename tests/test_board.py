@@ -9,9 +9,18 @@ Author: Daniel Edades
 
 import sys
 import pytest
+import random
 sys.path.append("..")
-from board import Board
+from board import Board, Space
 from board import Color
+from board import FILES, RANKS, WHITE, BLACK, KNIGHT, ROOK
+from board import SQUARE_NAMES, square_index, iter_squares
+from move import CAPTURE, PROMOTION, move_flags, move_name
+from piece import PieceColor, IllegalMoveException, IllegalPlacementException, Reason
+from pawn import Pawn
+from knight import Knight
+from rook import Rook
+from king import King
 
 ranks = (1, 2, 3, 4, 5, 6, 7, 8)
 files = ("a", "b", "c", "d", "e", "f", "g", "h")
@@ -77,3 +86,580 @@ class TestBoard:
 
                 assert retrieved_space.color == expected_color
 
+
+class TestOccupancy:
+
+    def test_empty_board(self):
+        test_board = Board()
+        assert test_board.occupied == 0
+        assert test_board.occupancy(WHITE) == 0
+        assert test_board.occupancy(BLACK) == 0
+
+    def test_place_sets_bits(self):
+        test_board = Board()
+        white_rook = Rook(PieceColor.WHITE)
+        black_knight = Knight(PieceColor.BLACK)
+        white_rook.place(test_board.get_space("a", 1))
+        black_knight.place(test_board.get_space("g", 8))
+
+        assert test_board.occupied == (1 << square_index("a", 1)) | (1 << square_index("g", 8))
+        assert test_board.occupancy(WHITE) == 1 << square_index("a", 1)
+        assert test_board.occupancy(BLACK, KNIGHT) == 1 << square_index("g", 8)
+        assert test_board.occupancy(kind=ROOK) == 1 << square_index("a", 1)
+        assert test_board.occupancy(WHITE, KNIGHT) == 0
+
+    def test_move_capture_remove_update_bits(self):
+        test_board = Board()
+        white_rook = Rook(PieceColor.WHITE)
+        black_knight = Knight(PieceColor.BLACK)
+        white_rook.place(test_board.get_space("a", 1))
+        black_knight.place(test_board.get_space("a", 5))
+
+        white_rook.move(test_board, test_board.get_space("a", 4))
+        assert test_board.occupancy(WHITE, ROOK) == 1 << square_index("a", 4)
+
+        white_rook.capture(test_board.get_space("a", 5))
+        assert test_board.occupancy(WHITE, ROOK) == 1 << square_index("a", 5)
+        assert test_board.occupancy(BLACK) == 0
+        assert test_board.get_space("a", 5).current_piece is white_rook
+
+        white_rook.remove()
+        assert test_board.occupied == 0
+        assert not test_board.get_space("a", 5).current_piece
+
+    def test_iter_squares(self):
+        bitboard = (1 << 0) | (1 << 9) | (1 << 63)
+        assert list(iter_squares(bitboard)) == [0, 9, 63]
+
+
+def try_move(piece, board, target):
+    """
+    Tries a move or capture through the piece's own rule methods, as the only way of finding
+    legal moves did before generate_moves.
+    """
+
+    try:
+        if target.current_piece:
+            piece.capture(target)
+        elif isinstance(piece, Knight):
+            piece.move(target)
+        else:
+            piece.move(board, target)
+    except IllegalMoveException:
+        return False
+    return True
+
+
+def random_placement(generator):
+    placement = {}
+    for kind in (Pawn, Pawn, Pawn, Pawn, Knight, Knight, Rook, Rook):
+        for color in (PieceColor.WHITE, PieceColor.BLACK):
+            file = generator.choice(FILES)
+            rank = generator.choice(RANKS)
+            if (file, rank) not in placement:
+                placement[(file, rank)] = (kind, color)
+    return placement
+
+
+def build(placement):
+    board = Board()
+    for (file, rank), (kind, color) in placement.items():
+        kind(color).place(board.get_space(file, rank))
+    return board
+
+
+class TestGenerateMoves:
+
+    def test_opening_position(self):
+        placement = {}
+        for file in FILES:
+            placement[(file, 2)] = (Pawn, PieceColor.WHITE)
+            placement[(file, 7)] = (Pawn, PieceColor.BLACK)
+        for file, kind in (("a", Rook), ("b", Knight), ("g", Knight), ("h", Rook)):
+            placement[(file, 1)] = (kind, PieceColor.WHITE)
+            placement[(file, 8)] = (kind, PieceColor.BLACK)
+        test_board = build(placement)
+
+        moves = test_board.generate_moves(PieceColor.WHITE)
+        assert len(moves) == 20
+        assert "e2e4" in [move_name(move) for move in moves]
+        assert len(test_board.generate_moves(BLACK)) == 20
+
+    def test_flags(self):
+        test_board = Board()
+        white_pawn = Pawn(PieceColor.WHITE)
+        white_pawn.place(test_board.get_space("b", 7))
+        Knight(PieceColor.BLACK).place(test_board.get_space("a", 8))
+
+        moves = {move_name(move): move_flags(move) for move in test_board.generate_moves(WHITE)}
+        assert moves == {"b7b8": PROMOTION, "b7a8": CAPTURE | PROMOTION}
+
+    def test_matches_piece_rules(self):
+        generator = random.Random(4)
+        for trial in range(6):
+            placement = random_placement(generator)
+            test_board = build(placement)
+            for color in (PieceColor.WHITE, PieceColor.BLACK):
+                generated = sorted(move_name(move) for move in test_board.generate_moves(color))
+
+                expected = []
+                for (file, rank), (kind, piece_color) in placement.items():
+                    if piece_color is not color:
+                        continue
+                    for target_file in FILES:
+                        for target_rank in RANKS:
+                            trial_board = build(placement)
+                            piece = trial_board.get_space(file, rank).current_piece
+                            target = trial_board.get_space(target_file, target_rank)
+                            if target is not piece.current_space and try_move(piece, trial_board, target):
+                                expected.append(file + str(rank) + target_file + str(target_rank))
+
+                assert generated == sorted(expected)
+
+
+class TestLegalityQueries:
+
+    def test_matches_generate_moves(self):
+        generator = random.Random(17)
+        for trial in range(6):
+            placement = random_placement(generator)
+            test_board = build(placement)
+            for color in (PieceColor.WHITE, PieceColor.BLACK):
+                generated = sorted(move_name(move) for move in test_board.generate_moves(color))
+
+                legal = []
+                for piece in test_board.pieces(color):
+                    for target in map(test_board.space_at, range(64)):
+                        if target.current_piece:
+                            reason = piece.is_legal_capture(test_board, target)
+                        else:
+                            reason = piece.is_legal_move(test_board, target)
+                        if reason is Reason.LEGAL:
+                            legal.append(piece.current_space.name + target.name)
+
+                assert generated == sorted(legal)
+
+    def test_reason_matches_exception(self):
+        generator = random.Random(18)
+        placement = random_placement(generator)
+        for (file, rank), (kind, color) in placement.items():
+            for target_file in FILES:
+                for target_rank in RANKS:
+                    trial_board = build(placement)
+                    piece = trial_board.get_space(file, rank).current_piece
+                    target = trial_board.get_space(target_file, target_rank)
+                    if target.current_piece and target.current_piece is not piece:
+                        reason = piece.is_legal_capture(trial_board, target)
+                    else:
+                        reason = piece.is_legal_move(trial_board, target)
+
+                    if reason is Reason.LEGAL:
+                        assert try_move(piece, trial_board, target)
+                    else:
+                        with pytest.raises(IllegalMoveException) as error:
+                            if target.current_piece and target.current_piece is not piece:
+                                piece.capture(target)
+                            elif isinstance(piece, Knight):
+                                piece.move(target)
+                            else:
+                                piece.move(trial_board, target)
+                        assert error.value.msg == reason.message
+
+    def test_query_leaves_board_unchanged(self):
+        test_board = Board()
+        rook = Rook(PieceColor.WHITE)
+        rook.place(test_board.get_space("a", 1))
+        Pawn(PieceColor.BLACK).place(test_board.get_space("a", 4))
+        hash_key = test_board.hash_key
+
+        assert rook.is_legal_capture(test_board, test_board.get_space("a", 4)) is Reason.LEGAL
+        assert rook.is_legal_move(test_board, test_board.get_space("a", 5)) is Reason.ROOK_BLOCKED
+        assert rook.is_legal_move(test_board, test_board.get_space("b", 2)) is Reason.ROOK_MOVE
+        assert rook.is_legal_move(test_board, "a2") is Reason.NOT_A_SPACE
+        assert test_board.hash_key == hash_key
+        assert rook.current_space.name == "a1"
+        assert not rook.moved
+
+    def test_piece_not_on_board(self):
+        test_board = Board()
+        for piece in (Pawn(PieceColor.WHITE), Knight(PieceColor.WHITE), Rook(PieceColor.WHITE),
+                      King(PieceColor.WHITE)):
+            assert piece.is_legal_move(test_board, test_board.get_space("c", 3)) is Reason.NOT_ON_BOARD
+            assert piece.is_legal_capture(test_board, test_board.get_space("c", 3)) is Reason.NOT_ON_BOARD
+            piece.place(test_board.get_space("d", 4))
+            assert piece.is_legal_move(test_board, "c3") is Reason.NOT_A_SPACE
+            assert piece.is_legal_capture(test_board, "c3") is Reason.NOT_A_SPACE
+            with pytest.raises(IllegalPlacementException):
+                piece.capture("c3")
+            piece.remove()
+
+
+def expected_attacks(board):
+    """
+    Works out the attack counts of each color from scratch, one piece at a time.
+    """
+
+    counts = ([0] * 64, [0] * 64)
+    for index in range(64):
+        piece = board.squares[index]
+        if piece is not None:
+            for target in iter_squares(piece.attacks_from(index, board.occupied)):
+                counts[piece.side][target] += 1
+    return counts
+
+
+class TestAttackMaps:
+
+    def test_is_attacked(self):
+        test_board = Board()
+        Rook(PieceColor.BLACK).place(test_board.get_space("a", 8))
+        Knight(PieceColor.WHITE).place(test_board.get_space("b", 1))
+        Pawn(PieceColor.WHITE).place(test_board.get_space("e", 2))
+
+        assert test_board.is_attacked(SQUARE_NAMES["a1"], BLACK)
+        assert test_board.is_attacked(SQUARE_NAMES["h8"], PieceColor.BLACK)
+        assert not test_board.is_attacked(SQUARE_NAMES["b7"], BLACK)
+        assert test_board.is_attacked(SQUARE_NAMES["c3"], WHITE)
+        assert test_board.is_attacked(SQUARE_NAMES["f3"], WHITE)
+        assert not test_board.is_attacked(SQUARE_NAMES["e3"], WHITE)
+
+    def test_blocking_and_unblocking(self):
+        test_board = Board()
+        rook = Rook(PieceColor.WHITE)
+        rook.place(test_board.get_space("a", 1))
+        knight = Knight(PieceColor.BLACK)
+        knight.place(test_board.get_space("a", 4))
+
+        assert test_board.is_attacked(SQUARE_NAMES["a4"], WHITE)
+        assert not test_board.is_attacked(SQUARE_NAMES["a5"], WHITE)
+
+        knight.move(test_board.get_space("c", 5))
+        assert test_board.is_attacked(SQUARE_NAMES["a8"], WHITE)
+
+        knight.remove()
+        assert test_board.attack_maps[BLACK] == 0
+        assert list(test_board.attack_counts) == list(expected_attacks(test_board))
+
+    def test_follows_make_and_unmake(self):
+        generator = random.Random(18)
+        for trial in range(4):
+            test_board = build(random_placement(generator))
+            side = WHITE
+            played = 0
+            for ply in range(30):
+                moves = test_board.generate_moves(side)
+                if not moves:
+                    break
+                test_board.make_move(generator.choice(moves))
+                played += 1
+                side = 1 - side
+                counts = expected_attacks(test_board)
+                assert list(test_board.attack_counts) == list(counts)
+                for color in (WHITE, BLACK):
+                    assert test_board.attack_maps[color] == sum(1 << index for index in range(64) if counts[color][index])
+            for ply in range(played):
+                test_board.unmake_move()
+            assert list(test_board.attack_counts) == list(expected_attacks(test_board))
+
+    def test_from_fen(self):
+        test_board = Board.from_fen("r3n3/8/8/3P4/8/8/1N6/R6r w - - 0 1")
+        assert list(test_board.attack_counts) == list(expected_attacks(test_board))
+        assert test_board.is_attacked(SQUARE_NAMES["a1"], BLACK)
+        assert test_board.is_attacked(SQUARE_NAMES["e6"], WHITE)
+
+
+class TestHash:
+
+    def test_empty_boards_match(self):
+        assert Board().hash_key == Board().hash_key == 0
+
+    def test_same_position_same_hash(self):
+        # Reach the same position by two different orders of moves.
+        first_board = Board()
+        first_rook = Rook(PieceColor.WHITE)
+        first_rook.place(first_board.get_space("a", 1))
+        first_rook.move(first_board, first_board.get_space("a", 4))
+        first_rook.move(first_board, first_board.get_space("d", 4))
+
+        second_board = Board()
+        second_rook = Rook(PieceColor.WHITE)
+        second_rook.place(second_board.get_space("a", 1))
+        second_rook.move(second_board, second_board.get_space("d", 1))
+        second_rook.move(second_board, second_board.get_space("d", 4))
+
+        placed_board = Board()
+        Rook(PieceColor.WHITE).place(placed_board.get_space("d", 4))
+
+        assert first_board.hash_key == second_board.hash_key == placed_board.hash_key
+        assert first_board.hash_key != 0
+
+    def test_hash_depends_on_piece(self):
+        rook_board = Board()
+        Rook(PieceColor.WHITE).place(rook_board.get_space("d", 4))
+        black_rook_board = Board()
+        Rook(PieceColor.BLACK).place(black_rook_board.get_space("d", 4))
+        knight_board = Board()
+        Knight(PieceColor.WHITE).place(knight_board.get_space("d", 4))
+
+        assert len({rook_board.hash_key, black_rook_board.hash_key, knight_board.hash_key}) == 3
+
+    def test_capture_and_remove(self):
+        test_board = Board()
+        white_knight = Knight(PieceColor.WHITE)
+        white_knight.place(test_board.get_space("b", 1))
+        Knight(PieceColor.BLACK).place(test_board.get_space("c", 3))
+
+        white_knight.capture(test_board.get_space("c", 3))
+        placed_board = Board()
+        Knight(PieceColor.WHITE).place(placed_board.get_space("c", 3))
+        assert test_board.hash_key == placed_board.hash_key
+
+        white_knight.remove()
+        assert test_board.hash_key == 0
+
+
+class TestMakeMove:
+
+    def test_make_and_unmake_capture(self):
+        test_board = Board()
+        white_rook = Rook(PieceColor.WHITE)
+        black_knight = Knight(PieceColor.BLACK)
+        white_rook.place(test_board.get_space("a", 1))
+        black_knight.place(test_board.get_space("a", 5))
+        starting_hash = test_board.hash_key
+
+        capture = [move for move in test_board.generate_moves(WHITE) if move_flags(move) & CAPTURE][0]
+        test_board.make_move(capture)
+
+        assert white_rook.current_space is test_board.get_space("a", 5)
+        assert white_rook.moved is True
+        assert black_knight.current_space is None
+        assert not test_board.get_space("a", 1).current_piece
+        assert test_board.occupancy(BLACK) == 0
+
+        test_board.unmake_move()
+
+        assert white_rook.current_space is test_board.get_space("a", 1)
+        assert white_rook.moved is False
+        assert black_knight.current_space is test_board.get_space("a", 5)
+        assert test_board.get_space("a", 5).current_piece is black_knight
+        assert test_board.hash_key == starting_hash
+        assert not test_board.undo_stack
+
+    def test_unmake_in_order(self):
+        test_board = Board()
+        white_pawn = Pawn(PieceColor.WHITE)
+        white_pawn.place(test_board.get_space("e", 2))
+        starting_squares = list(test_board.squares)
+
+        for target_rank in (4, 5, 6):
+            move = [move for move in test_board.generate_moves(WHITE)
+                    if move_name(move).endswith("e" + str(target_rank))][0]
+            test_board.make_move(move)
+        assert white_pawn.current_space.name == "e6"
+
+        for undo in range(3):
+            test_board.unmake_move()
+        assert test_board.squares == starting_squares
+        assert white_pawn.current_space.name == "e2"
+        assert white_pawn.moved is False
+
+
+class TestSpaceTable:
+
+    def test_spaces_are_slotted(self):
+        test_board = Board()
+        assert not hasattr(test_board.get_space("a", 1), "__dict__")
+        assert not hasattr(Rook(PieceColor.WHITE), "__dict__")
+
+    def test_same_space_each_time(self):
+        test_board = Board()
+        assert test_board.get_space("e", 4) is test_board.get_space("e", 4)
+        assert test_board.spaces[4][3] is test_board.get_space("e", 4)
+
+    def test_standalone_space(self):
+        test_space = Space("c", 5)
+        assert test_space.name == "c5"
+        assert test_space.color == Color.DARK
+        assert not test_space.current_piece
+
+        test_knight = Knight(PieceColor.WHITE)
+        test_knight.place(test_space)
+        assert test_space.current_piece is test_knight
+
+    def test_bad_space(self):
+        with pytest.raises(ValueError):
+            Space("i", 1)
+        assert Board().get_space("a", 9) is None
+
+
+class TestSquareIndex:
+
+    def test_space_at(self):
+        test_board = Board()
+        for file in files:
+            for rank in ranks:
+                test_space = test_board.get_space(file, rank)
+                assert test_board.space_at(test_space.index) is test_space
+                assert test_space.file_index == files.index(file)
+                assert test_space.rank_index == rank - 1
+                assert SQUARE_NAMES[test_space.name] == test_space.index
+
+    def test_corners(self):
+        test_board = Board()
+        assert test_board.space_at(0).name == "a1"
+        assert test_board.space_at(7).name == "h1"
+        assert test_board.space_at(56).name == "a8"
+        assert test_board.space_at(63).name == "h8"
+
+
+class TestPieceLists:
+
+    def test_pieces_follow_moves(self):
+        test_board = Board()
+        white_rook = Rook(PieceColor.WHITE)
+        white_knight = Knight(PieceColor.WHITE)
+        black_pawn = Pawn(PieceColor.BLACK)
+        white_rook.place(test_board.get_space("a", 1))
+        white_knight.place(test_board.get_space("g", 1))
+        black_pawn.place(test_board.get_space("a", 7))
+
+        assert test_board.pieces(PieceColor.WHITE) == [white_rook, white_knight]
+        assert test_board.pieces(WHITE, KNIGHT) == [white_knight]
+        assert test_board.pieces(PieceColor.BLACK) == [black_pawn]
+        assert test_board.count(PieceColor.WHITE) == 2
+
+        white_rook.capture(test_board.get_space("a", 7))
+        assert test_board.pieces(PieceColor.BLACK) == []
+        assert test_board.pieces(WHITE, ROOK) == [white_rook]
+
+        white_knight.remove()
+        assert test_board.pieces(PieceColor.WHITE) == [white_rook]
+        assert test_board.count(WHITE, KNIGHT) == 0
+
+
+class TestFen:
+
+    def test_round_trip(self):
+        fen = "rn2k1nr/pppp1ppp/8/4p3/4P3/5N2/PPPP1PPP/RN2K2R b Kkq - 0 1"
+        test_board = Board.from_fen(fen)
+        assert test_board.to_fen(BLACK) == fen
+
+    def test_matches_placed_pieces(self):
+        test_board = Board.from_fen("8/8/8/3n4/8/8/4P3/R7 w - - 0 1")
+
+        placed_board = Board()
+        Rook(PieceColor.WHITE).place(placed_board.get_space("a", 1))
+        Pawn(PieceColor.WHITE).place(placed_board.get_space("e", 2))
+        Knight(PieceColor.BLACK).place(placed_board.get_space("d", 5))
+
+        assert test_board.hash_key == placed_board.hash_key
+        assert test_board.occupancy(WHITE) == placed_board.occupancy(WHITE)
+        assert test_board.occupancy(BLACK, KNIGHT) == placed_board.occupancy(BLACK, KNIGHT)
+        knight = test_board.get_space("d", 5).current_piece
+        assert isinstance(knight, Knight)
+        assert knight.current_space is test_board.get_space("d", 5)
+        assert sorted(map(move_name, test_board.generate_moves(WHITE))) == \
+            sorted(map(move_name, placed_board.generate_moves(WHITE)))
+
+    def test_moved_flags(self):
+        test_board = Board.from_fen("r6r/8/8/8/8/4P3/3P4/R6R w Kq - 0 1")
+        assert test_board.get_space("d", 2).current_piece.moved is False
+        assert test_board.get_space("e", 3).current_piece.moved is True
+        assert test_board.get_space("h", 1).current_piece.moved is False
+        assert test_board.get_space("a", 1).current_piece.moved is True
+        assert test_board.get_space("a", 8).current_piece.moved is False
+
+    def test_castling_needs_unmoved_king(self):
+        assert Board.from_fen("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1").to_fen() == \
+            "r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1"
+        assert Board.from_fen("r6r/8/8/8/8/8/8/R6R w KQkq - 0 1").to_fen() == "r6r/8/8/8/8/8/8/R6R w - - 0 1"
+        assert Board.from_fen("r3k2r/8/8/8/8/8/8/R3K2R w - - 0 1").to_fen() == "r3k2r/8/8/8/8/8/8/R3K2R w - - 0 1"
+
+        test_board = Board.from_fen("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1")
+        test_board.get_space("e", 1).current_piece.move(test_board.get_space("e", 2))
+        test_board.get_space("e", 2).current_piece.move(test_board.get_space("e", 1))
+        assert test_board.to_fen(BLACK) == "r3k2r/8/8/8/8/8/8/R3K2R b kq - 0 1"
+
+    def test_en_passant_square(self):
+        test_board = Board.from_fen("4k3/8/8/3pP3/8/8/8/4K3 w - - 0 2")
+        assert test_board.to_fen(WHITE, SQUARE_NAMES["d6"]) == "4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1"
+
+    def test_bad_fen(self):
+        for fen in ("", "8/8/8 w - - 0 1", "9/8/8/8/8/8/8/8 w - - 0 1", "8/8/8/8/8/8/8/7X w - - 0 1"):
+            with pytest.raises(ValueError):
+                Board.from_fen(fen)
+
+    def test_unsupported_piece(self):
+        with pytest.raises(ValueError) as info:
+            Board.from_fen("8/8/8/8/8/8/8/3Q4 w - - 0 1")
+        assert "not supported" in str(info)
+
+
+class TestCopy:
+
+    FEN = "r3k2r/ppp2ppp/2n5/3pP3/8/5N2/PPP2PPP/R3K2R w Kq - 0 1"
+
+    def test_same_position(self):
+        test_board = Board.from_fen(self.FEN)
+        copy = test_board.copy()
+        assert copy.to_fen(WHITE) == test_board.to_fen(WHITE)
+        assert copy.hash_key == test_board.hash_key
+        assert copy.attack_counts == test_board.attack_counts
+        assert copy.attack_maps == test_board.attack_maps
+        assert (copy.middlegame_score, copy.endgame_score, copy.phase) == \
+            (test_board.middlegame_score, test_board.endgame_score, test_board.phase)
+        assert sorted(copy.legal_moves(WHITE)) == sorted(test_board.legal_moves(WHITE))
+
+    def test_pieces_made_when_needed(self):
+        test_board = Board.from_fen(self.FEN)
+        copy = test_board.copy()
+        assert "squares" not in copy.__dict__
+        assert copy.occupancy(BLACK, KNIGHT) == test_board.occupancy(BLACK, KNIGHT)
+        assert "squares" not in copy.__dict__
+
+        knight = copy.get_space("c", 6).current_piece
+        assert isinstance(knight, Knight)
+        assert knight is not test_board.get_space("c", 6).current_piece
+        assert knight.current_space is copy.get_space("c", 6)
+        assert "squares" in copy.__dict__
+
+    def test_moved_flags(self):
+        copy = Board.from_fen(self.FEN).copy()
+        assert copy.get_space("h", 1).current_piece.moved is False
+        assert copy.get_space("a", 1).current_piece.moved is True
+        assert copy.get_space("a", 7).current_piece.moved is False
+        assert copy.get_space("d", 5).current_piece.moved is True
+
+    def test_independent(self):
+        test_board = Board.from_fen(self.FEN)
+        fen = test_board.to_fen(WHITE)
+        copy = test_board.copy()
+
+        for move in copy.legal_moves(WHITE):
+            copy.make_move(move)
+            copy.unmake_move()
+        copy.make_move(copy.legal_moves(WHITE)[0])
+        assert copy.to_fen(WHITE) != fen
+        assert test_board.to_fen(WHITE) == fen
+
+        copy = test_board.copy()
+        copy_fen = copy.to_fen(WHITE)
+        for move in test_board.legal_moves(WHITE):
+            test_board.make_move(move)
+            test_board.unmake_move()
+        test_board.make_move(test_board.legal_moves(WHITE)[0])
+        assert copy.to_fen(WHITE) == copy_fen
+        assert not copy.undo_stack
+
+    def test_copy_of_copy(self):
+        test_board = Board.from_fen(self.FEN)
+        copy = test_board.copy().copy()
+        assert copy.to_fen(WHITE) == test_board.to_fen(WHITE)
+        assert copy.get_space("e", 5).current_piece is not test_board.get_space("e", 5).current_piece
+
+        move = copy.legal_moves(WHITE)[0]
+        copy.make_move(move)
+        copy.unmake_move()
+        assert copy.to_fen(WHITE) == test_board.to_fen(WHITE)
+        assert copy.hash_key == test_board.hash_key
@@ -0,0 +1,105 @@
+"""
+Tests for evaluation, checking that the Board's
+running scores always match a full count of its
+pieces, and that the scores are symmetric.
+"""
+
+import random
+import sys
+sys.path.append("..")
+import evaluate
+from board import Board, WHITE, BLACK, SQUARE_NAMES
+from piece import PieceColor
+from pawn import Pawn
+from knight import Knight
+from rook import Rook
+from position import setup_board, standard_board
+
+
+def scan(board):
+    """
+    Adds up the scores of every piece on the Board, one square at a time.
+    """
+
+    middlegame = endgame = phase = 0
+    for index in range(64):
+        piece = board.squares[index]
+        if piece is not None:
+            middlegame += evaluate.MIDDLEGAME_SCORES[piece.side][piece.kind][index]
+            endgame += evaluate.ENDGAME_SCORES[piece.side][piece.kind][index]
+            phase += evaluate.PHASE_WEIGHTS[piece.kind]
+    return middlegame, endgame, phase
+
+
+def running(board):
+    return board.middlegame_score, board.endgame_score, board.phase
+
+
+class TestRunningScores:
+
+    def test_piece_methods(self):
+        test_board = Board()
+        rook = Rook(PieceColor.WHITE)
+        rook.place(test_board.get_space("a", 1))
+        knight = Knight(PieceColor.BLACK)
+        knight.place(test_board.get_space("b", 8))
+        pawn = Pawn(PieceColor.BLACK)
+        pawn.place(test_board.get_space("a", 7))
+        assert running(test_board) == scan(test_board)
+
+        rook.move(test_board, test_board.get_space("a", 5))
+        knight.move(test_board.get_space("c", 6))
+        assert running(test_board) == scan(test_board)
+
+        rook.capture(test_board.get_space("a", 7))
+        assert running(test_board) == scan(test_board)
+
+        knight.remove()
+        rook.remove()
+        assert running(test_board) == (0, 0, 0)
+
+    def test_make_and_unmake(self):
+        generator = random.Random(23)
+        test_board = standard_board()
+        start = running(test_board)
+        side = WHITE
+        for ply in range(60):
+            moves = test_board.generate_moves(side)
+            if not moves:
+                break
+            test_board.make_move(generator.choice(moves))
+            side = 1 - side
+            assert running(test_board) == scan(test_board)
+        while test_board.undo_stack:
+            test_board.unmake_move()
+        assert running(test_board) == start
+
+    def test_from_fen(self):
+        test_board = Board.from_fen("r3n3/p7/8/3P4/8/8/1N6/R6r w - - 0 1")
+        assert running(test_board) == scan(test_board)
+
+
+class TestEvaluate:
+
+    def test_opening_is_even(self):
+        test_board = standard_board()
+        assert evaluate.evaluate(test_board, WHITE) == 0
+        assert evaluate.evaluate(test_board, BLACK) == 0
+
+    def test_mirror_image(self):
+        white_up = setup_board("Nd4 Pe5 Ra1", "Pa7 Nb8")
+        black_up = setup_board("Pa2 Nb1", "Nd5 Pe4 Ra8")
+        assert evaluate.evaluate(white_up, WHITE) == evaluate.evaluate(black_up, BLACK)
+        assert evaluate.evaluate(white_up, WHITE) == -evaluate.evaluate(white_up, BLACK)
+
+    def test_piece_square_tables(self):
+        # A centralized Knight is worth more than one in the corner, and an advanced Pawn more than one at home.
+        assert evaluate.evaluate(setup_board("Nd4", ""), WHITE) > evaluate.evaluate(setup_board("Na1", ""), WHITE)
+        assert evaluate.evaluate(setup_board("", "Pa3"), BLACK) > evaluate.evaluate(setup_board("", "Pa7"), BLACK)
+
+    def test_phase(self):
+        test_board = standard_board()
+        assert test_board.phase == 4 * evaluate.PHASE_WEIGHTS[2] + 4 * evaluate.PHASE_WEIGHTS[4]
+        # With no pieces but Pawns left, only the endgame scores count.
+        pawns = setup_board("Pa5", "")
+        assert evaluate.evaluate(pawns, WHITE) == pawns.endgame_score
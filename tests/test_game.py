@@ -0,0 +1,163 @@
+"""
+Tests for the Game class, checking the ring-buffer
+move log, taking moves back, and capturing en passant.
+"""
+
+import sys
+import pytest
+sys.path.append("..")
+from game import Game
+from board import WHITE, BLACK, SQUARE_NAMES
+from move import EN_PASSANT, move_flags, move_name
+from piece import PieceColor, IllegalMoveException, Reason
+from position import setup_board
+
+
+def names(moves):
+    return [move_name(move) for move in moves]
+
+
+class TestMoveLog:
+
+    def test_last_move(self):
+        game = Game()
+        assert game.last_move is None
+        game.play_name("e2e4")
+        game.play_name("g8f6")
+        assert move_name(game.last_move) == "g8f6"
+        assert game.side == WHITE
+        assert len(game) == 2
+
+    def test_ring_buffer_wraps(self):
+        game = Game(setup_board("Ra1", "Rh8"), capacity=4)
+        for ply in range(5):
+            game.play_name(("a1a2", "h8h7", "a2a1", "h7h8")[ply % 4])
+        assert len(game) == 5
+        assert len(game.log) == 4
+        assert names(game.moves()) == ["h8h7", "a2a1", "h7h8", "a1a2"]
+        assert move_name(game.last_move) == "a1a2"
+
+    def test_undo_stack_is_bounded(self):
+        game = Game(setup_board("Ra1", "Rh8"), capacity=4)
+        for ply in range(40):
+            game.play_name(("a1a2", "h8h7", "a2a1", "h7h8")[ply % 4])
+        assert len(game.board.undo_stack) == 3
+
+        for ply in range(3):
+            game.take_back()
+        assert move_name(game.last_move) == "a1a2"
+        with pytest.raises(ValueError):
+            game.take_back()
+
+    def test_illegal_move(self):
+        game = Game()
+        with pytest.raises(ValueError):
+            game.play_name("e2e5")
+        assert len(game) == 0
+
+    def test_move_counters(self):
+        game = Game.from_fen("4k3/p7/8/8/8/8/8/R3K3 b - - 7 30")
+        game.play_name("e8d8")
+        assert (game.halfmove, game.fullmove) == (8, 31)
+        game.play_name("a1a7")
+        assert (game.halfmove, game.fullmove) == (0, 31)
+        game.play_name("d8c8")
+        assert game.to_fen() == "2k5/R7/8/8/8/8/8/4K3 w - - 1 32"
+
+        game.take_back()
+        game.take_back()
+        assert (game.halfmove, game.fullmove) == (8, 31)
+        game.take_back()
+        assert game.to_fen() == "4k3/p7/8/8/8/8/8/R3K3 b - - 7 30"
+
+        with pytest.raises(ValueError):
+            Game.from_fen("4k3/8/8/8/8/8/8/4K3 w - - 0 0")
+
+    def test_play_with_known_moves(self):
+        game = Game()
+        moves = game.legal_moves()
+        with pytest.raises(ValueError):
+            game.play(moves[0], moves[1:])
+        game.play(moves[0], moves)
+        assert game.last_move == moves[0]
+
+    def test_opening_position_has_kings(self):
+        game = Game()
+        assert game.to_fen() == "rn2k1nr/pppppppp/8/8/8/8/PPPPPPPP/RN2K1NR w KQkq - 0 1"
+        for name in ("e2e4", "d7d5", "e1e2", "d5d4"):
+            game.play_name(name)
+        assert "e2e3" not in names(game.legal_moves())
+        assert "e2d3" in names(game.legal_moves())
+
+
+class TestEnPassant:
+
+    def test_capture_en_passant(self):
+        game = Game(setup_board("Ke1 Pe5", "Ke8 Pd7"), BLACK)
+        game.play_name("d7d5")
+        assert game.en_passant == SQUARE_NAMES["d6"]
+
+        capture = [move for move in game.legal_moves() if move_name(move) == "e5d6"]
+        assert len(capture) == 1 and move_flags(capture[0]) & EN_PASSANT
+        game.play(capture[0])
+
+        board = game.board
+        assert board.get_space("d", 5).current_piece is None
+        assert board.get_space("d", 6).current_piece.side == WHITE
+        assert board.count(BLACK) == 1
+
+        game.take_back()
+        assert board.get_space("d", 5).current_piece.side == BLACK
+        assert board.get_space("e", 5).current_piece.side == WHITE
+        assert board.get_space("d", 6).current_piece is None
+        assert game.en_passant == SQUARE_NAMES["d6"]
+
+    def test_only_on_next_move(self):
+        game = Game(setup_board("Ke1 Pe5", "Ke8 Pd7 Ph7"), BLACK)
+        game.play_name("d7d5")
+        game.play_name("e1e2")
+        game.play_name("h7h6")
+        assert game.en_passant is None
+        assert "e5d6" not in names(game.legal_moves())
+
+    def test_exposes_king(self):
+        # Taking en passant would leave the fifth rank open between the Rook and the King.
+        game = Game(setup_board("Ka5 Pb5", "Rh5 Ke8 Pc7"), BLACK)
+        game.play_name("c7c5")
+        assert "b5c6" not in names(game.legal_moves())
+
+    def test_from_fen(self):
+        game = Game.from_fen("4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 2")
+        assert game.side == WHITE
+        assert "e5d6" in names(game.legal_moves())
+        assert game.to_fen() == "4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 2"
+        game.play_name("e1e2")
+        assert game.to_fen() == "4k3/8/8/3pP3/8/8/4K3/8 b - - 1 2"
+
+    def test_bad_en_passant_square(self):
+        for fen in ("4k3/8/8/3P4/8/8/8/4K3 w - e6 0 1",
+                    "4k3/8/8/3Pn3/8/8/8/4K3 w - e6 0 1",
+                    "4k3/8/8/3P4/8/3p4/8/4K3 w - e4 0 1",
+                    "4k3/8/4n3/3Pp3/8/8/8/4K3 w - e6 0 1",
+                    "4k3/4n3/8/3Pp3/8/8/8/4K3 w - e6 0 1",
+                    "4k3/8/8/8/3pP3/8/8/4K3 w - e3 0 1",
+                    "4k3/8/8/8/3pP3/8/8/4K3 b - e6 0 1"):
+            with pytest.raises(ValueError):
+                Game.from_fen(fen)
+        assert "d4e3" in names(Game.from_fen("4k3/8/8/8/3pP3/8/8/4K3 b - e3 0 1").legal_moves())
+
+    def test_pawn_capture(self):
+        game = Game(setup_board("Ke1 Pe5", "Ke8 Pd7"), BLACK)
+        game.play_name("d7d5")
+        board = game.board
+        pawn = board.get_space("e", 5).current_piece
+        target = board.get_space("d", 6)
+
+        with pytest.raises(IllegalMoveException):
+            pawn.capture(target)
+        assert pawn.is_legal_capture(board, target, game) is Reason.LEGAL
+
+        pawn.capture(target, game=game)
+        assert pawn.current_space is target
+        assert board.get_space("d", 5).current_piece is None
+        assert board.count(PieceColor.BLACK) == 1
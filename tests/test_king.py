@@ -0,0 +1,80 @@
+"""
+Tests for the King class to ensure correct
+movement and capturing one space in any direction.
+"""
+
+import sys
+import pytest
+sys.path.append("..")
+from board import *
+from king import King
+from knight import Knight
+from piece import PieceColor, Reason
+from piece import IllegalMoveException
+
+
+@pytest.fixture
+def test_board():
+    test_board = Board()
+    return test_board
+
+
+@pytest.fixture
+def test_white_king(test_board):
+    test_king = King(PieceColor.WHITE)
+    test_king.place(test_board.get_space("e", 1))
+    return test_king
+
+
+class TestMoveKing:
+
+    def test_move_one_space(self, test_board, test_white_king):
+        for file, rank in (("e", 2), ("f", 3), ("f", 2), ("e", 1), ("d", 1)):
+            target = test_board.get_space(file, rank)
+            test_white_king.move(target)
+            assert test_white_king.current_space is target
+            assert target.current_piece is test_white_king
+        assert test_white_king.moved
+
+    def test_bad_king_move(self, test_board, test_white_king):
+        with pytest.raises(IllegalMoveException) as error:
+            test_white_king.move(test_board.get_space("e", 3))
+        assert error.value.msg == Reason.KING_MOVE.message
+        assert test_white_king.current_space is test_board.get_space("e", 1)
+
+    def test_move_into_occupied(self, test_board, test_white_king):
+        Knight(PieceColor.WHITE).place(test_board.get_space("d", 2))
+        with pytest.raises(IllegalMoveException):
+            test_white_king.move(test_board.get_space("d", 2))
+
+
+class TestKingCapture:
+
+    def test_king_capture(self, test_board, test_white_king):
+        black_knight = Knight(PieceColor.BLACK)
+        black_knight.place(test_board.get_space("f", 2))
+        test_white_king.capture(test_board.get_space("f", 2))
+        assert test_white_king.current_space is test_board.get_space("f", 2)
+        assert black_knight.current_space is None
+
+    def test_bad_king_capture(self, test_board, test_white_king):
+        Knight(PieceColor.BLACK).place(test_board.get_space("e", 3))
+        with pytest.raises(IllegalMoveException) as error:
+            test_white_king.capture(test_board.get_space("e", 3))
+        assert error.value.msg == Reason.KING_CAPTURE.message
+
+
+class TestKingTargets:
+
+    def test_targets_from_corner(self, test_board):
+        test_king = King(PieceColor.BLACK)
+        test_king.place(test_board.get_space("h", 8))
+        assert sorted(space.name for space in test_king.targets(test_board)) == ["g7", "g8", "h7"]
+
+    def test_targets_in_middle(self, test_board):
+        test_king = King(PieceColor.WHITE)
+        test_king.place(test_board.get_space("d", 4))
+        Knight(PieceColor.WHITE).place(test_board.get_space("d", 5))
+        Knight(PieceColor.BLACK).place(test_board.get_space("e", 5))
+        assert sorted(space.name for space in test_king.targets(test_board)) == \
+            ["c3", "c4", "c5", "d3", "e3", "e4", "e5"]
@@ -275,4 +275,38 @@ class TestKnightCapture:
     def test_bad_knight_capture(self, test_board, test_white_knight, test_black_knight):
         with pytest.raises(IllegalMoveException) as info:
             self.bad_knight_capture(test_board, test_white_knight, test_black_knight)
-        assert "A Knight must capture two spaces straight and one space perpendicular." in str(info)
\ No newline at end of file
+        assert "A Knight must capture two spaces straight and one space perpendicular." in str(info)
+
+class TestKnightTargets:
+
+    def test_targets_from_corner(self, test_board, test_white_knight):
+        targets = test_white_knight.targets(test_board)
+        assert sorted(space.name for space in targets) == ["a3", "c3", "d2"]
+
+    def test_targets_skip_own_pieces(self, test_board, test_white_knight):
+        Knight(PieceColor.WHITE).place(test_board.get_space("d", 2))
+        Knight(PieceColor.BLACK).place(test_board.get_space("c", 3))
+
+        targets = test_white_knight.targets(test_board)
+        assert sorted(space.name for space in targets) == ["a3", "c3"]
+
+    def test_targets_match_move(self, test_board):
+        # Every target should be accepted by move() and every other Space rejected.
+        test_knight = Knight(PieceColor.WHITE)
+        for file in FILES:
+            for rank in RANKS:
+                starting_space = test_board.get_space(file, rank)
+                test_knight.place(starting_space)
+                targets = test_knight.targets(test_board)
+                for target_file in FILES:
+                    for target_rank in RANKS:
+                        target_space = test_board.get_space(target_file, target_rank)
+                        if target_space is starting_space:
+                            continue
+                        if target_space in targets:
+                            test_knight.move(target_space)
+                            assert test_knight.current_space is target_space
+                            test_knight.place(starting_space)
+                        else:
+                            with pytest.raises(IllegalMoveException):
+                                test_knight.move(target_space)
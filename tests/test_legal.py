@@ -0,0 +1,109 @@
+"""
+Tests for legal move generation, checking that moves
+which would leave a player's own King in check are
+left out, and nothing else is.
+"""
+
+import random
+import sys
+sys.path.append("..")
+import legal
+from board import Board, FILES, RANKS, WHITE, BLACK, SQUARE_NAMES
+from move import move_name
+from position import setup_board
+
+
+def names(moves):
+    return sorted(move_name(move) for move in moves)
+
+
+def brute_force_legal(board, side):
+    """
+    Finds the legal moves by playing each move and checking whether the King is left in check.
+    """
+
+    moves = []
+    for move in board.generate_moves(side):
+        board.make_move(move)
+        if not board.in_check(side):
+            moves.append(move)
+        board.unmake_move()
+    return moves
+
+
+def random_position(generator):
+    squares = generator.sample([file + str(rank) for file in FILES for rank in RANKS], 14)
+    white = ["K" + squares[0]] + [generator.choice("PNRR") + square for square in squares[2:8]]
+    black = ["K" + squares[1]] + [generator.choice("PNRR") + square for square in squares[8:14]]
+    # Pawns never stand on the first or last rank.
+    white = [piece for piece in white if not (piece[0] == "P" and piece[2] in "18")]
+    black = [piece for piece in black if not (piece[0] == "P" and piece[2] in "18")]
+    return setup_board(" ".join(white), " ".join(black))
+
+
+class TestChecksAndPins:
+
+    def test_single_check(self):
+        test_board = setup_board("Ke1 Ra4 Nc3 Ph2", "Re8 Ka8")
+        assert test_board.in_check(WHITE)
+        assert legal.checkers(test_board, WHITE) == 1 << SQUARE_NAMES["e8"]
+        # Block on the e-file with the Rook or the Knight, or step off the file.
+        assert names(legal.legal_moves(test_board, WHITE)) == \
+            ["a4e4", "c3e2", "c3e4", "e1d1", "e1d2", "e1f1", "e1f2"]
+
+    def test_king_cannot_retreat_along_check(self):
+        test_board = setup_board("Kd4", "Rd8 Ka8")
+        moves = names(legal.legal_moves(test_board, WHITE))
+        assert "d4d3" not in moves
+        assert "d4c3" in moves
+
+    def test_double_check(self):
+        test_board = setup_board("Ke1 Ra1 Nb1", "Re8 Nd3 Kh8")
+        assert legal.checkers(test_board, WHITE) == (1 << SQUARE_NAMES["e8"]) | (1 << SQUARE_NAMES["d3"])
+        assert names(legal.legal_moves(test_board, WHITE)) == ["e1d1", "e1d2", "e1f1"]
+
+    def test_pin(self):
+        test_board = setup_board("Ke1 Re4 Nd2", "Re8 Ra2 Kh8")
+        pinned = legal.pins(test_board, WHITE)
+        assert list(pinned) == [SQUARE_NAMES["e4"]]
+        moves = names(legal.legal_moves(test_board, WHITE))
+        assert "e4e8" in moves and "e4e5" in moves and "e4e2" in moves
+        assert "e4a4" not in moves
+
+    def test_checkmate(self):
+        test_board = setup_board("Ka1", "Ra2 Rh2 Rb8 Kh8")
+        assert names(legal.legal_moves(test_board, WHITE)) == []
+        assert legal.is_checkmate(test_board, WHITE)
+
+    def test_stalemate(self):
+        test_board = setup_board("Ka1", "Rb8 Rh2 Kh8")
+        assert not test_board.in_check(WHITE)
+        assert legal.is_stalemate(test_board, WHITE)
+        assert not legal.is_checkmate(test_board, WHITE)
+
+    def test_no_king(self):
+        test_board = setup_board("Ra1 Pe2", "Ra8")
+        assert names(legal.legal_moves(test_board, WHITE)) == names(test_board.generate_moves(WHITE))
+
+
+class TestMatchesBruteForce:
+
+    def test_random_positions(self):
+        generator = random.Random(19)
+        for trial in range(40):
+            test_board = random_position(generator)
+            for side in (WHITE, BLACK):
+                assert names(test_board.legal_moves(side)) == names(brute_force_legal(test_board, side))
+
+    def test_random_games(self):
+        generator = random.Random(20)
+        for trial in range(10):
+            test_board = random_position(generator)
+            side = WHITE
+            for ply in range(20):
+                moves = test_board.legal_moves(side)
+                assert names(moves) == names(brute_force_legal(test_board, side))
+                if not moves:
+                    break
+                test_board.make_move(generator.choice(moves))
+                side = 1 - side
@@ -0,0 +1,86 @@
+"""
+Tests for move ordering, checking the order of
+captures, killer moves and history moves, and that
+ordering cuts down the nodes the search visits.
+"""
+
+import sys
+sys.path.append("..")
+import ordering
+import search
+from board import WHITE, SQUARE_NAMES
+from move import CAPTURE, encode_move, move_name
+from perft import REFERENCE_POSITIONS
+from position import setup_board
+
+
+def move(name, flags=0):
+    return encode_move(SQUARE_NAMES[name[:2]], SQUARE_NAMES[name[2:]], flags)
+
+
+def ordered(scorer, board, moves, hash_move=None, ply=0):
+    moves = list(moves)
+    scores = scorer.score(board, moves, hash_move, ply)
+    for index in range(len(moves)):
+        ordering.pick(moves, scores, index)
+    return [move_name(each) for each in moves]
+
+
+class Unordered(ordering.MoveOrdering):
+
+    def score(self, board, moves, hash_move=None, ply=0):
+        return [0] * len(moves)
+
+    def record_cutoff(self, move, depth, ply):
+        pass
+
+
+class TestScores:
+
+    def test_mvv_lva(self):
+        test_board = setup_board("Pc4 Nb3 Ra5", "Rd5 Pb5 Na4")
+        captures = [move("c4d5", CAPTURE), move("c4b5", CAPTURE), move("b3d4"), move("a5a4", CAPTURE),
+                    move("b3c5"), move("a5b5", CAPTURE)]
+        names = ordered(ordering.MoveOrdering(), test_board, captures)
+        # The Rook is the most valuable victim; then the Knight; then the Pawn, taken by a Pawn first.
+        assert names[:4] == ["c4d5", "a5a4", "c4b5", "a5b5"]
+
+    def test_hash_move_first(self):
+        test_board = setup_board("Pc4 Nb3", "Rd5")
+        quiet = move("b3d2")
+        names = ordered(ordering.MoveOrdering(), test_board, [move("c4d5", CAPTURE), quiet], hash_move=quiet)
+        assert names == ["b3d2", "c4d5"]
+
+    def test_killers_and_history(self):
+        test_board = setup_board("Nb1 Ph2", "Ph7")
+        scorer = ordering.MoveOrdering()
+        moves = [move("b1a3"), move("b1c3"), move("b1d2"), move("h2h3")]
+
+        scorer.record_cutoff(move("h2h3"), 5, 0)
+        scorer.record_cutoff(move("b1d2"), 1, 3)
+        assert ordered(scorer, test_board, moves, ply=0)[0] == "h2h3"
+        # At another ply h2h3 is not a killer, but its history still puts it ahead of b1d2.
+        assert ordered(scorer, test_board, moves, ply=3)[:2] == ["b1d2", "h2h3"]
+        assert ordered(scorer, test_board, moves, ply=1)[:2] == ["h2h3", "b1d2"]
+
+    def test_captures_not_recorded(self):
+        scorer = ordering.MoveOrdering()
+        scorer.record_cutoff(move("c4d5", CAPTURE), 4, 0)
+        assert scorer.killers[0] == 0
+        assert not any(scorer.history)
+
+    def test_age(self):
+        scorer = ordering.MoveOrdering()
+        scorer.record_cutoff(move("h2h3"), 4, 0)
+        scorer.age()
+        assert scorer.history[move("h2h3") & 4095] == 8
+
+
+class TestSearchNodes:
+
+    def test_fewer_nodes(self):
+        white, black, color, expected = REFERENCE_POSITIONS["open files"]
+        plain = search.Searcher(ordering=Unordered()).search(setup_board(white, black), color, 4)
+        ordered_result = search.Searcher().search(setup_board(white, black), color, 4)
+        assert ordered_result.score == plain.score
+        assert ordered_result.nodes * 2 < plain.nodes
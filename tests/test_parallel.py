@@ -0,0 +1,50 @@
+"""
+Tests for the parallel runner, checking that
+splitting work across processes gives the same
+counts as running it in one process.
+"""
+
+import sys
+import pytest
+sys.path.append("..")
+from perft import REFERENCE_POSITIONS, setup_board, perft
+from parallel import parallel_perft, perft_positions, parallel_validate
+from piece import PieceColor
+
+
+class TestParallel:
+
+    def test_parallel_perft(self):
+        white, black, color, expected = REFERENCE_POSITIONS["open files"]
+        report = parallel_perft(setup_board(white, black), color, 3, workers=2, split_depth=2)
+        assert report.total == expected[3]
+        assert sum(count for count, seconds in report.workers.values()) == expected[3]
+        assert report.per_second() > 0
+
+        test_board = setup_board("Ke2 Rd1 Nc3 Pf2", "Ke8 Ra2 Nf6 Pd4")
+        assert parallel_perft(test_board, PieceColor.WHITE, 3, workers=2).total == perft(test_board, PieceColor.WHITE, 3)
+
+    def test_perft_positions(self):
+        positions = []
+        expected_counts = []
+        for white, black, color, expected in REFERENCE_POSITIONS.values():
+            positions.append((setup_board(white, black), color))
+            expected_counts.append(expected[2])
+
+        counts, report = perft_positions(positions, 2, workers=2, chunk_size=1)
+        assert counts == expected_counts
+        assert report.total == sum(expected_counts)
+
+    def test_parallel_validate(self):
+        np = pytest.importorskip("numpy")
+        import batch
+
+        boards = [setup_board(white, black) for white, black, color, expected in REFERENCE_POSITIONS.values()]
+        pieces, moved = batch.encode_boards(boards)
+        board_ids = np.repeat(np.arange(len(boards)), 64 * 64)
+        origins = np.tile(np.repeat(np.arange(64), 64), len(boards))
+        targets = np.tile(np.arange(64), 64 * len(boards))
+
+        reasons, report = parallel_validate(pieces, moved, board_ids, origins, targets, workers=2, chunk_size=5000)
+        assert list(reasons) == list(batch.validate(pieces, moved, board_ids, origins, targets))
+        assert report.total == len(board_ids)
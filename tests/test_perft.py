@@ -0,0 +1,63 @@
+"""
+Tests for perft, checking move generation
+against the reference counts for each
+reference position.
+"""
+
+import sys
+import pytest
+sys.path.append("..")
+from perft import REFERENCE_POSITIONS, setup_board, perft, divide, benchmark
+from piece import PieceColor
+
+
+class TestPerft:
+
+    @pytest.mark.parametrize("name", sorted(REFERENCE_POSITIONS))
+    def test_reference_counts(self, name):
+        white, black, color, expected = REFERENCE_POSITIONS[name]
+        for depth in (1, 2, 3):
+            assert perft(setup_board(white, black), color, depth) == expected[depth]
+
+    def test_board_restored(self):
+        white, black, color, expected = REFERENCE_POSITIONS["open files"]
+        test_board = setup_board(white, black)
+        before = list(test_board.squares)
+        moved = [piece.moved for piece in before if piece]
+
+        perft(test_board, color, 3)
+
+        assert test_board.squares == before
+        assert [piece.moved for piece in test_board.squares if piece] == moved
+        for index, piece in enumerate(test_board.squares):
+            if piece:
+                assert piece.current_space.index == index
+
+    def test_divide_sums_to_perft(self):
+        white, black, color, expected = REFERENCE_POSITIONS["promotion race"]
+        counts = divide(setup_board(white, black), color, 2)
+        assert len(counts) == expected[1]
+        assert sum(counts.values()) == expected[2]
+
+    def test_only_legal_moves(self):
+        assert perft(setup_board("Ke1", "Ke8 Ra2"), PieceColor.WHITE, 1) == 2
+
+        # Counted again by playing every generated move and dropping those that leave the King in check.
+        def count(board, side, depth):
+            if depth == 0:
+                return 1
+            nodes = 0
+            for move in board.generate_moves(side):
+                board.make_move(move)
+                if not board.in_check(side):
+                    nodes += count(board, 1 - side, depth - 1)
+                board.unmake_move()
+            return nodes
+
+        test_board = setup_board("Ke2 Rd1 Nc3 Pf2", "Ke8 Ra2 Nf6 Pd4")
+        assert perft(test_board, PieceColor.WHITE, 3) == count(test_board, 0, 3)
+
+    def test_benchmark(self):
+        nodes, elapsed, nodes_per_second = benchmark("opening", 2)
+        assert nodes == 400
+        assert nodes_per_second > 0
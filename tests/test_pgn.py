@@ -0,0 +1,126 @@
+"""
+Tests for PGN reading and replay, checking that
+games are split and parsed correctly and that
+their moves are checked against the piece rules.
+"""
+
+import io
+import sys
+import pytest
+sys.path.append("..")
+import pgn
+from board import WHITE, BLACK
+from move import move_name
+from position import standard_board, setup_board
+
+
+ARCHIVE = """[Event "First"]
+[White "A"]
+[Black "B"]
+
+1. e4 e5 2. Nf3 {a comment
+that spans lines} Nc6 3. d4 (3. Nc3 Nf6) exd4 4. Nxd4 $1 Nxd4 ; rest of line
+5. a4 Rb8 1-0
+
+[Event "Second"]
+
+1. e4 e5 2. Bc4 0-1
+
+[Event "Third"]
+
+1. e4 e5 2. e5 *
+
+[Event "Fourth"]
+[FEN "4k3/8/8/8/8/8/P7/4K3 w - - 0 1"]
+
+1. a4 *
+
+[Event "Fifth"]
+[FEN "8/p7/8/8/8/8/P7/8 b - - 0 1"]
+
+1... a5 2. a4 *
+"""
+
+
+class TestReadGames:
+
+    def test_split_and_parse(self):
+        games = list(pgn.read_games(io.StringIO(ARCHIVE)))
+        assert [game.headers["Event"] for game in games] == ["First", "Second", "Third", "Fourth", "Fifth"]
+        assert games[0].moves == ["e4", "e5", "Nf3", "Nc6", "d4", "exd4", "Nxd4", "Nxd4", "a4", "Rb8"]
+        assert games[0].result == "1-0"
+        assert games[1].result == "0-1"
+
+    def test_game_without_result(self):
+        games = list(pgn.read_games(io.StringIO('[Event "A"]\n1. e4\n[Event "B"]\n1. d4 *\n')))
+        assert [game.moves for game in games] == [["e4"], ["d4"]]
+        assert games[0].result == "*"
+
+
+class TestReplay:
+
+    def test_statuses(self):
+        results = list(pgn.replay(io.StringIO(ARCHIVE)))
+        assert [result.status for result in results] == [pgn.LEGAL, pgn.UNSUPPORTED, pgn.ILLEGAL,
+                                                          pgn.LEGAL, pgn.LEGAL]
+        assert results[0].plies == 10
+        assert (results[1].plies, results[1].move) == (2, "Bc4")
+        assert (results[2].plies, results[2].move) == (2, "e5")
+
+    def test_king_moves(self):
+        results = list(pgn.replay(io.StringIO("1. e4 e5 2. Ke2 Ke7 3. Ke3 * 1. e4 e5 2. Ke2 Ke7 3. Ke1 Kd6 4. Ke2 *")))
+        assert [result.status for result in results] == [pgn.LEGAL, pgn.LEGAL]
+
+        # Walking into the Pawn on d4's attack, and not answering its check, are both illegal.
+        results = list(pgn.replay(io.StringIO("1. e4 d5 2. Ke2 d4 3. Ke3 * 1. e4 d5 2. Ke2 d4 3. Kd3 *"
+                                              " 1. e4 e5 2. Ke2 d5 3. Ke3 d4+ 4. Nf3 *")))
+        assert [(result.status, result.plies, result.move) for result in results] == [
+            (pgn.ILLEGAL, 4, "Ke3"), (pgn.LEGAL, 5, None), (pgn.ILLEGAL, 6, "Nf3")]
+
+    def test_missing_pieces(self):
+        # The Bishops and Queens are missing, so moves onto, through, or checked along a line through
+        # their home squares are unsupported rather than judged without them.
+        games = ("1. Nf3 Nf6 2. Rg1 Ng8 3. Rf1 *",
+                 "1. e4 e5 2. Ke2 Ke7 3. Kd1 *",
+                 "1. Nc3 a6 2. Ne4 a5 3. Nc5 a4 4. Ne6 a3 5. Nxd8 *",
+                 "1. e4 a6 2. Ke2 a5 3. Nc3 a4 4. Nf3 a3 5. Rb1 h6 6. Rbg1 *",
+                 "1. a4 h5 2. Ra3 Rh6 3. Rb3 Ra6 4. Nc3 Rxa4 5. h3 Ra1 6. h4 *",
+                 "1. a4 h5 2. Ra3 Rh6 3. Rb3 Re6 4. Nc3 Rxe2+ 5. h3 *")
+        results = [pgn.replay_game(game) for game in pgn.read_games(games)]
+        assert [(result.status, result.plies, result.move) for result in results] == [
+            (pgn.UNSUPPORTED, 4, "Rf1"),
+            (pgn.UNSUPPORTED, 4, "Kd1"),
+            (pgn.UNSUPPORTED, 8, "Nxd8"),
+            (pgn.UNSUPPORTED, 10, "Rbg1"),
+            (pgn.UNSUPPORTED, 10, "h4"),
+            (pgn.ILLEGAL, 8, "h3")]
+
+    def test_en_passant(self):
+        results = list(pgn.replay(io.StringIO("1. e4 Nf6 2. e5 d5 3. exd6 * 1. e4 Nf6 2. e5 d5 3. a3 a6 4. exd6 *")))
+        assert [result.status for result in results] == [pgn.LEGAL, pgn.ILLEGAL]
+        assert results[0].plies == 5
+        assert (results[1].plies, results[1].move) == (6, "exd6")
+
+    def test_resolve_san(self):
+        test_board = standard_board()
+        assert move_name(pgn.resolve_san(test_board, WHITE, "Nf3")) == "g1f3"
+        assert move_name(pgn.resolve_san(test_board, WHITE, "e4")) == "e2e4"
+        assert pgn.resolve_san(test_board, WHITE, "e5") is None
+        assert pgn.resolve_san(test_board, WHITE, "Nd2") is None
+        with pytest.raises(ValueError):
+            pgn.resolve_san(test_board, WHITE, "O-O")
+
+    def test_disambiguation(self):
+        test_board = setup_board("Nb5 Nf5 Ra1 Rh1 Rh5", "Pd6")
+
+        assert pgn.resolve_san(test_board, WHITE, "Nxd6") is None
+        assert move_name(pgn.resolve_san(test_board, WHITE, "Nbxd6")) == "b5d6"
+        assert move_name(pgn.resolve_san(test_board, WHITE, "Nfxd6+")) == "f5d6"
+        assert move_name(pgn.resolve_san(test_board, WHITE, "Rad1")) == "a1d1"
+        assert move_name(pgn.resolve_san(test_board, WHITE, "R1h3")) == "h1h3"
+        assert move_name(pgn.resolve_san(test_board, WHITE, "R5h3")) == "h5h3"
+
+    def test_pinned_piece_needs_no_disambiguation(self):
+        # The Knight on c3 is pinned against the King, so Ne2 can only mean the Knight on g1.
+        test_board = setup_board("Kc1 Nc3 Ng1", "Rc8 Kh8")
+        assert move_name(pgn.resolve_san(test_board, WHITE, "Ne2")) == "g1e2"
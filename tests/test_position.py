@@ -0,0 +1,104 @@
+"""
+Tests for position encoding, checking that a
+Board survives being encoded and decoded.
+"""
+
+import sys
+import pytest
+sys.path.append("..")
+from board import WHITE, BLACK
+from perft import REFERENCE_POSITIONS, setup_board
+import position
+
+
+class TestEncoding:
+
+    @pytest.mark.parametrize("name", sorted(REFERENCE_POSITIONS))
+    def test_round_trip(self, name):
+        white, black, color, expected = REFERENCE_POSITIONS[name]
+        test_board = setup_board(white, black)
+        test_board.make_move(test_board.generate_moves(color)[0])
+
+        encoded = position.encode(test_board)
+        assert len(encoded) == position.RECORD_SIZE
+
+        decoded = position.decode(encoded)
+        assert decoded.hash_key == test_board.hash_key
+        assert position.encode(decoded) == encoded
+        for index, piece in enumerate(test_board.squares):
+            copy = decoded.squares[index]
+            if piece is None:
+                assert copy is None
+            else:
+                assert type(copy) is type(piece)
+                assert copy.color is piece.color
+                assert copy.moved == piece.moved
+                assert copy.current_space is decoded.space_at(index)
+
+
+class TestReadPositions:
+
+    def test_fen_and_epd(self):
+        lines = [
+            "# a comment",
+            "rn4nr/pppppppp/8/8/8/8/PPPPPPPP/RN4NR w KQkq - 0 1",
+            "",
+            'rn4nr/pppppppp/8/8/4P3/8/PPPP1PPP/RN4NR b KQkq - bm Nc6; id "after e4";',
+        ]
+        positions = list(position.read_positions(lines))
+        assert len(positions) == 2
+
+        board, side, operations = positions[0]
+        assert side == WHITE
+        assert operations == {}
+        assert board.hash_key == position.standard_board().hash_key
+
+        board, side, operations = positions[1]
+        assert side == BLACK
+        assert operations == {"bm": "Nc6", "id": "after e4"}
+        assert len(board.generate_moves(side)) == 20
+
+    def test_load_positions(self, tmp_path):
+        path = tmp_path / "positions.epd"
+        path.write_text("8/8/8/8/8/8/P7/8 w - -\n8/p7/8/8/8/8/8/8 b - -\n")
+        assert [side for board, side, operations in position.load_positions(str(path))] == [WHITE, BLACK]
+
+
+class TestPositionStore:
+
+    def test_append_and_read(self, tmp_path):
+        boards = [setup_board(white, black) for white, black, color, expected in REFERENCE_POSITIONS.values()]
+        boards[0].make_move(boards[0].generate_moves(WHITE)[0])
+
+        with position.PositionStore(str(tmp_path / "positions.bin")) as store:
+            assert len(store) == 0
+            store.extend(boards)
+            assert len(store) == len(boards)
+            for number, board in enumerate(boards):
+                assert store[number].hash_key == board.hash_key
+                assert position.encode(store[number]) == position.encode(board)
+            assert store[-1].hash_key == boards[-1].hash_key
+
+            # The store can keep growing after it has been read.
+            store.append(boards[1])
+            assert len(store) == len(boards) + 1
+            assert store[len(boards)].hash_key == boards[1].hash_key
+
+        assert (tmp_path / "positions.bin").stat().st_size == position.RECORD_SIZE * (len(boards) + 1)
+
+    def test_records_view(self, tmp_path):
+        np = pytest.importorskip("numpy")
+        boards = [setup_board(white, black) for white, black, color, expected in REFERENCE_POSITIONS.values()]
+
+        with position.PositionStore(str(tmp_path / "positions.bin")) as store:
+            store.extend(boards)
+            records = store.records()
+            assert len(records) == len(boards)
+            assert [int(occupied) for occupied in records["occupied"]] == [board.occupied for board in boards]
+            assert not records.flags.owndata
+            del records
+
+    def test_too_many_pieces(self):
+        with pytest.raises(ValueError):
+            position.encode(setup_board(" ".join("P" + file + str(rank) for file in "abcdefgh" for rank in (2, 3, 4, 5, 6)),
+                                        ""))
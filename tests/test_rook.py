@@ -189,4 +189,32 @@ class TestMoveRook:
     def test_bad_rook_move_large_l(self, test_board, test_white_rook):
         with pytest.raises(IllegalMoveException) as info:
             self.bad_rook_move_large_l(test_board, test_white_rook)
-        assert "A rook must move entirely vertically or entirely horizontally." in str(info)
\ No newline at end of file
+        assert "A rook must move entirely vertically or entirely horizontally." in str(info)
+
+
+class TestRookTargets:
+
+    def test_targets_open_board(self, test_board, test_white_rook):
+        targets = test_white_rook.targets(test_board)
+        assert len(targets) == 14
+
+    def test_targets_stop_at_pieces(self, test_board, test_white_rook):
+        Rook(PieceColor.WHITE).place(test_board.get_space("a", 4))
+        Rook(PieceColor.BLACK).place(test_board.get_space("c", 1))
+
+        targets = test_white_rook.targets(test_board)
+        assert sorted(space.name for space in targets) == ["a2", "a3", "b1", "c1"]
+
+
+class TestCaptureRook:
+
+    def test_capture(self, test_board, test_white_rook, test_black_rook):
+        test_white_rook.capture(test_board.get_space("a", 8))
+        assert test_white_rook.current_space is test_board.get_space("a", 8)
+        assert test_black_rook.current_space is None
+
+    def test_capture_blocked(self, test_board, test_white_rook, test_black_rook):
+        Rook(PieceColor.WHITE).place(test_board.get_space("a", 4))
+        with pytest.raises(IllegalMoveException) as info:
+            test_white_rook.capture(test_board.get_space("a", 8))
+        assert "A Rook cannot move over any other piece." in str(info)
@@ -0,0 +1,81 @@
+"""
+Tests for the search, checking that it finds
+winning moves and checkmates, and that it keeps
+within its node and time budgets.
+"""
+
+import sys
+sys.path.append("..")
+import search
+from board import WHITE, BLACK, PAWN
+from evaluate import MIDDLEGAME_VALUES
+from move import move_name
+from position import setup_board, standard_board
+from transposition import TranspositionTable
+
+
+class TestSearch:
+
+    def test_takes_free_piece(self):
+        test_board = setup_board("Nc3 Pa2", "Rd5 Ph7")
+        result = search.search(test_board, WHITE, depth=3)
+        assert move_name(result.best_move) == "c3d5"
+        assert result.score > MIDDLEGAME_VALUES[PAWN]
+
+    def test_avoids_losing_exchange(self):
+        # The Pawn on d5 is defended by the Pawn on e6, so taking it with the Rook loses the Rook.
+        test_board = setup_board("Rd1 Ph2", "Pd5 Pe6 Ph7")
+        result = search.search(test_board, WHITE, depth=2)
+        assert move_name(result.best_move) != "d1d5"
+
+    def test_finds_checkmate(self):
+        test_board = setup_board("Kg1 Ra1", "Kg8 Pf7 Pg7 Ph7")
+        result = search.search(test_board, WHITE, depth=4)
+        assert move_name(result.best_move) == "a1a8"
+        assert result.score > search.MATE_BOUND
+
+    def test_checkmated(self):
+        test_board = setup_board("Ka1", "Ra2 Rh2 Rb8 Kh8")
+        result = search.search(test_board, WHITE, depth=3)
+        assert result.best_move is None
+        assert result.depth == 0
+
+    def test_board_unchanged(self):
+        test_board = standard_board()
+        fen = test_board.to_fen()
+        search.search(test_board, WHITE, depth=3)
+        assert test_board.to_fen() == fen
+        assert test_board.undo_stack == []
+
+
+class TestBudgets:
+
+    def test_node_budget(self):
+        result = search.search(standard_board(), WHITE, nodes=500)
+        assert result.stopped
+        assert result.nodes <= 500
+        assert result.best_move is not None
+
+    def test_time_budget(self):
+        # With no time at all, the search stops the first time it looks at the clock.
+        result = search.search(standard_board(), BLACK, seconds=0)
+        assert result.stopped
+        assert result.nodes <= search.CLOCK_INTERVAL
+        assert result.best_move is not None
+
+        result = search.search(standard_board(), BLACK, seconds=0.2)
+        assert result.stopped
+        assert result.depth >= 1
+        assert result.per_second() > 0
+
+    def test_depth_limit(self):
+        result = search.search(standard_board(), WHITE, depth=2)
+        assert not result.stopped
+        assert result.depth == 2
+
+    def test_table_is_reused(self):
+        table = TranspositionTable(1 << 12)
+        first = search.search(standard_board(), WHITE, depth=3, table=table)
+        second = search.search(standard_board(), WHITE, depth=3, table=table)
+        assert second.nodes < first.nodes
+        assert table.hits > 0
@@ -0,0 +1,166 @@
+"""
+Tests for the game server, talking to it through
+an in-process client over a local socket.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append("..")
+import position
+import server
+from board import WHITE
+from game import Game
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+class TestRequests:
+
+    def test_play_moves(self):
+        async def session():
+            game_server = server.GameServer(executor=ThreadPoolExecutor(1))
+            game = (await game_server.handle("NEW")).split()[1]
+            answers = [await game_server.handle("MOVE " + game + " " + name) for name in ("e2e4", "e7e5", "e4e5")]
+            moves = await game_server.handle("MOVES " + game)
+            await game_server.close()
+            return answers, moves
+
+        answers, moves = run(session())
+        assert answers[0].startswith("OK ") and " b " in answers[0]
+        assert answers[1].startswith("OK ")
+        assert answers[2] == "ILLEGAL A Pawn may only capture one space ahead diagonally."
+        assert "g1f3" in moves.split()
+
+    def test_illegal_reasons(self):
+        async def session():
+            game_server = server.GameServer(executor=ThreadPoolExecutor(1))
+            game = (await game_server.handle("NEW 4k3/8/8/8/8/8/4R3/r3K3 w - - 0 1")).split()[1]
+            answers = [await game_server.handle("MOVE " + game + " " + name)
+                       for name in ("e2d3", "a1a2", "c3c4", "e2e4", "e1d2")]
+            await game_server.close()
+            return answers
+
+        answers = run(session())
+        assert answers[0] == "ILLEGAL A rook must move entirely vertically or entirely horizontally."
+        assert answers[1] == "ILLEGAL That piece belongs to the other player."
+        assert answers[2] == "ILLEGAL There is no piece on that space."
+        # The King is in check from the Rook on a1, so the Rook on e2 cannot leave to e4.
+        assert answers[3] == "ILLEGAL That move would leave the King in check."
+        assert answers[4] == "OK 4k3/8/8/8/8/8/3KR3/r7 b - - 1 1"
+
+    def test_errors(self):
+        async def session():
+            game_server = server.GameServer(executor=ThreadPoolExecutor(1))
+            answers = [await game_server.handle(line) for line in
+                       ("JUMP 1", "MOVE 7 e2e4", "MOVE", "NEW 9/8 w", "STATS",
+                        "NEW 4k3/8/8/3Pn3/8/8/8/4K3 w - e6 0 1")]
+            await game_server.close()
+            return answers
+
+        answers = run(session())
+        assert answers[0] == "ERROR Unknown command."
+        assert answers[1] == "ERROR No game 7."
+        assert answers[2] == "ERROR Missing argument."
+        assert answers[3].startswith("ERROR ")
+        assert answers[4].startswith("OK games=0")
+        assert answers[5] == "ERROR No Pawn can have just passed over e6."
+
+    def test_bad_analysis_time(self):
+        async def session():
+            game_server = server.GameServer(executor=ThreadPoolExecutor(1))
+            game = (await game_server.handle("NEW")).split()[1]
+            answers = [await game_server.handle("ANALYSE " + game + " " + seconds)
+                       for seconds in ("nan", "inf", "-1", "0")]
+            await game_server.close()
+            return answers
+
+        assert run(session()) == ["ERROR The analysis time must be a positive number of seconds."] * 4
+
+    def test_node_budget(self):
+        move, score, depth, nodes = server.analyse(position.encode(Game().board), WHITE, 10.0, nodes=300)
+        assert move is not None
+        assert nodes <= 300
+
+    def test_busy(self):
+        async def session():
+            game_server = server.GameServer(executor=ThreadPoolExecutor(1), max_pending=1, max_games=1)
+            game = (await game_server.handle("NEW")).split()[1]
+            second = await game_server.handle("NEW")
+            first = asyncio.ensure_future(game_server.handle("ANALYSE " + game + " 0.2"))
+            await asyncio.sleep(0.05)
+            busy = await game_server.handle("ANALYSE " + game + " 0.2")
+            await first
+            await game_server.close()
+            return second, busy, first.result()
+
+        second, busy, first = run(session())
+        assert second == "BUSY Too many games."
+        assert busy == "BUSY Too many analyses waiting."
+        assert first.startswith("OK ")
+
+
+class TestConnections:
+
+    def test_tcp_with_worker_processes(self):
+        async def session():
+            game_server = server.GameServer(workers=1)
+            listener = await game_server.start()
+            port = listener.sockets[0].getsockname()[1]
+
+            client = await server.Client.connect(port=port)
+            game = (await client.request("NEW")).split()[1]
+            analysis = asyncio.ensure_future(client.request("ANALYSE " + game + " 2"))
+
+            # While the worker searches, the event loop still answers other clients.
+            other = await server.Client.connect(port=port)
+            other_game = (await other.request("NEW")).split()[1]
+            moved = await other.request("MOVE " + other_game + " d2d4")
+            still_analysing = not analysis.done()
+
+            answer = await analysis
+            stats = await other.request("STATS")
+            await client.close()
+            await other.close()
+            await game_server.close()
+            return answer, moved, still_analysing, stats
+
+        answer, moved, still_analysing, stats = run(session())
+        words = answer.split()
+        assert words[0] == "OK" and len(words[1]) == 4 and int(words[3]) >= 1
+        assert moved.startswith("OK ")
+        assert still_analysing
+        assert "ANALYSE:n=1" in stats and "MOVE:n=1" in stats
+
+    def test_unix_socket(self):
+        async def session(path):
+            game_server = server.GameServer(executor=ThreadPoolExecutor(1))
+            await game_server.start_unix(path)
+            client = await server.Client.connect(path=path)
+            game = (await client.request("NEW")).split()[1]
+            fen = await client.request("FEN " + game)
+            closed = await client.request("CLOSE " + game)
+            await client.close()
+            await game_server.close()
+            return fen, closed
+
+        with tempfile.TemporaryDirectory() as directory:
+            fen, closed = run(session(os.path.join(directory, "games.sock")))
+        assert fen == "OK rn2k1nr/pppppppp/8/8/8/8/PPPPPPPP/RN2K1NR w KQkq - 0 1"
+        assert closed == "OK"
+
+
+class TestLatencyHistogram:
+
+    def test_percentiles(self):
+        histogram = server.LatencyHistogram()
+        for milliseconds in range(1, 101):
+            histogram.record(milliseconds / 1000)
+        assert histogram.count == 100
+        assert 0.05 <= histogram.percentile(0.5) <= 0.1
+        assert histogram.percentile(0.99) >= 0.099
+        assert histogram.maximum == 0.1
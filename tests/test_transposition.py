@@ -0,0 +1,77 @@
+"""
+Tests for the TranspositionTable class to ensure
+entries are stored, found, and replaced according
+to the chosen replacement policy.
+"""
+
+import sys
+import pytest
+sys.path.append("..")
+from transposition import TranspositionTable, Replacement
+from perft import REFERENCE_POSITIONS, setup_board
+
+
+@pytest.fixture
+def test_table():
+    return TranspositionTable(size=16)
+
+
+class TestTranspositionTable:
+
+    def test_size_is_fixed(self):
+        assert len(TranspositionTable(size=16)) == 16
+        assert len(TranspositionTable(size=100)) == 128
+
+    def test_bad_size(self):
+        with pytest.raises(ValueError):
+            TranspositionTable(size=0)
+
+    def test_store_and_probe(self, test_table):
+        white, black, color, expected = REFERENCE_POSITIONS["opening"]
+        key = setup_board(white, black).hash_key
+        test_table.store(key, 2, expected[2])
+
+        assert test_table.probe(key, 2) == expected[2]
+        assert test_table.probe(key, 1) == expected[2]
+        assert test_table.hits == 2
+        assert test_table.filled() == 1
+
+    def test_shallower_than_requested(self, test_table):
+        test_table.store(5, 1, "shallow")
+        assert test_table.probe(5, 2) is None
+        assert test_table.misses == 1
+        assert test_table.collisions == 0
+
+    def test_collision(self, test_table):
+        # Both keys map to the same slot of a 16-slot table.
+        test_table.store(3, 1, "first")
+        assert test_table.probe(3 + 16) is None
+        assert test_table.collisions == 1
+        assert test_table.misses == 1
+
+    def test_depth_preferred(self, test_table):
+        test_table.store(3, 4, "deep")
+        assert not test_table.store(3 + 16, 2, "shallow")
+        assert test_table.probe(3) == "deep"
+
+        assert test_table.store(3 + 16, 4, "as deep")
+        assert test_table.probe(3 + 16) == "as deep"
+
+        # The same position is always updated.
+        assert test_table.store(3 + 16, 1, "update")
+        assert test_table.probe(3 + 16) == "update"
+
+    def test_always_replace(self):
+        test_table = TranspositionTable(size=16, replacement=Replacement.ALWAYS)
+        test_table.store(3, 4, "deep")
+        assert test_table.store(3 + 16, 2, "shallow")
+        assert test_table.probe(3) is None
+        assert test_table.probe(3 + 16) == "shallow"
+
+    def test_clear(self, test_table):
+        test_table.store(3, 1, "value")
+        test_table.probe(3)
+        test_table.clear()
+        assert test_table.probe(3) is None
+        assert test_table.filled() == 0
+        assert test_table.hits == 0
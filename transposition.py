@@ -0,0 +1,100 @@
+"""
+Transposition table
+A fixed-size cache of results keyed by position hash (see
+Board.hash_key), so that a position reached again through a
+different order of moves does not have to be analysed again.
+
+The table is preallocated when it is created and never grows.
+Each entry lives in a slot chosen by the low bits of its key,
+and the keys and depths are held in flat arrays rather than
+one object per entry. When two positions need the same slot,
+the replacement policy decides which one keeps it.
+"""
+
+from array import array
+from enum import Enum
+
+
+class Replacement(Enum):
+    # Keep whichever entry was searched at least as deeply, as it cost more to find.
+    DEPTH_PREFERRED = 1
+    # Always keep the newest entry.
+    ALWAYS = 2
+
+
+EMPTY = -1
+
+
+class TranspositionTable:
+
+    def __init__(self, size=1 << 16, replacement=Replacement.DEPTH_PREFERRED):
+        if size < 1:
+            raise ValueError("A transposition table needs at least one slot.")
+
+        # Round the size up to a power of two so that a slot is found by masking the key.
+        slots = 1 << (size - 1).bit_length()
+        self.mask = slots - 1
+        self.replacement = replacement
+
+        self.keys = array("Q", bytes(8 * slots))
+        self.depths = array("h", [EMPTY]) * slots
+        self.values = [None] * slots
+
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+
+    def __len__(self):
+        return len(self.values)
+
+    def probe(self, key, depth=0):
+        """
+        Gets the value stored for a position key, or None if there is none stored to at least the
+        given depth. A slot holding a different position counts as a collision as well as a miss.
+        """
+
+        slot = key & self.mask
+        stored_depth = self.depths[slot]
+
+        if stored_depth != EMPTY and self.keys[slot] == key:
+            if stored_depth >= depth:
+                self.hits += 1
+                return self.values[slot]
+        elif stored_depth != EMPTY:
+            self.collisions += 1
+
+        self.misses += 1
+        return None
+
+    def store(self, key, depth, value):
+        """
+        Stores a value for a position key, found by a search of the given depth. Returns whether
+        the value was kept, which under the depth-preferred policy it is not when the slot holds
+        a deeper result for another position.
+        """
+
+        slot = key & self.mask
+        stored_depth = self.depths[slot]
+
+        if (self.replacement is Replacement.DEPTH_PREFERRED and stored_depth != EMPTY and
+                self.keys[slot] != key and stored_depth > depth):
+            return False
+
+        self.keys[slot] = key
+        self.depths[slot] = depth
+        self.values[slot] = value
+        return True
+
+    def clear(self):
+        for slot in range(len(self.values)):
+            self.depths[slot] = EMPTY
+            self.values[slot] = None
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+
+    def filled(self):
+        """
+        Gets the number of slots in use.
+        """
+        return len(self.depths) - self.depths.count(EMPTY)